@@ -0,0 +1,85 @@
+# benchmarks/bench_connections.py
+#
+# Compares the old connect-per-call pattern with the pooled StudentManager.
+# Run from the project root:  python -m benchmarks.bench_connections --ops 100000
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from benchmarks.datagen import build_database, generate_students
+from managers.student_manager import StudentManager
+
+
+class ConnectPerCallManager(StudentManager):
+    """Reproduces the previous behaviour: a fresh connection for every call"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self._opened = []
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path)
+        self._opened.append(conn)
+        return conn
+
+    def _close_opened(self):
+        for conn in self._opened:
+            conn.close()
+        self._opened.clear()
+
+
+def run_mixed_workload(manager, ops, seed_rows, seed=7, after_op=None):
+    """Run `ops` mixed CRUD calls (reads-heavy, like the GUI) and return ops/sec"""
+    rng = random.Random(seed)
+    new_students = generate_students(ops, seed=seed + 1)
+    known_ids = list(range(1, seed_rows + 1))
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        choice = rng.random()
+        if choice < 0.4:
+            manager.get_student_by_id(rng.choice(known_ids))
+        elif choice < 0.6:
+            manager.validate_unique_roll(str(rng.randint(1000000, 9999999)))
+        elif choice < 0.75:
+            name, contact, _ = next(new_students)
+            manager.update_student(rng.choice(known_ids), name, contact, str(rng.randint(1000000, 9999999)))
+        elif choice < 0.95:
+            name, contact, roll = next(new_students)
+            manager.add_student(name, contact, "9" + roll[1:])
+        else:
+            manager.delete_student(rng.choice(known_ids))
+        if after_op:
+            after_op()
+    elapsed = time.perf_counter() - start
+    return ops / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection pooling benchmark")
+    parser.add_argument("--ops", type=int, default=100000, help="number of mixed CRUD calls")
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the seed database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = build_database(os.path.join(tmp, "before.db"), args.rows)
+        after_path = build_database(os.path.join(tmp, "after.db"), args.rows)
+
+        before = ConnectPerCallManager(before_path)
+        before_rate = run_mixed_workload(before, args.ops, args.rows, after_op=before._close_opened)
+
+        after = StudentManager(after_path)
+        after_rate = run_mixed_workload(after, args.ops, args.rows)
+        after.close()
+
+    print(f"{args.ops} mixed CRUD calls on {args.rows} rows")
+    print(f"  connect-per-call : {before_rate:10.0f} ops/sec")
+    print(f"  pooled           : {after_rate:10.0f} ops/sec")
+    print(f"  speed-up         : {after_rate / before_rate:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
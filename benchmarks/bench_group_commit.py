@@ -0,0 +1,78 @@
+# benchmarks/bench_group_commit.py
+#
+# Concurrent add/update/delete throughput with direct commits vs the group-commit queue
+# in each durability mode. Every thread acts like one clerk issuing writes back to back.
+# Run from the project root:  python -m benchmarks.bench_group_commit --threads 32 --writes 200
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+from benchmarks.datagen import build_database, generate_students
+from managers.student_manager import StudentManager
+
+# (label, durability); None commits each write with the pool's default synchronous=NORMAL
+MODES = [("direct", None), ("full", "full"), ("grouped", "grouped"), ("relaxed", "relaxed")]
+
+
+def clerk(manager, students, seed, failures):
+    """Add each student, then update or delete some of the ones just added"""
+    rng = random.Random(seed)
+    for name, contact, roll in students:
+        success, _ = manager.add_student(name, contact, roll)
+        if not success:
+            failures.append(roll)
+            continue
+        if rng.random() < 0.3:
+            row = manager.get_student_by_roll(roll)
+            if rng.random() < 0.5:
+                manager.update_student(row[0], name + " Jr", contact, roll)
+            else:
+                manager.delete_student(row[0])
+
+
+def run(db_path, durability, threads, writes):
+    manager = StudentManager(db_path, durability=durability)
+    students = list(generate_students(threads * writes, seed=hash(db_path) % 1000))
+    failures = []
+    workers = [threading.Thread(target=clerk, args=(manager, students[i::threads], i, failures))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    metrics = manager.writes.metrics() if manager.writes else None
+    manager.close()
+    return elapsed, failures, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group-commit benchmark")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200, help="students added per thread")
+    args = parser.parse_args()
+
+    print(f"{args.threads} thread(s) x {args.writes} add(s), ~30% followed by an update or delete")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, durability in MODES:
+            db_path = os.path.join(tmp, f"{label}.db")
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_database(db_path, 0)
+            elapsed, failures, metrics = run(db_path, durability, args.threads, args.writes)
+            adds = args.threads * args.writes
+            line = f"  {label:<8}{adds / elapsed:>10.0f} adds/s  {elapsed:>7.2f}s"
+            if metrics:
+                line += f"  {metrics['writes_per_commit']:>6} writes/commit"
+            if failures:
+                line += f"  ({len(failures)} failed)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
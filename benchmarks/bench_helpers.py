@@ -0,0 +1,109 @@
+# benchmarks/bench_helpers.py
+#
+# Throughput of the utils.helpers validators, one value at a time vs the batch APIs,
+# against the previous implementations (kept below for comparison).
+# Run from the project root:  python -m benchmarks.bench_helpers --count 1000000
+
+import argparse
+import random
+import re
+import time
+from benchmarks.datagen import generate_students
+from utils import helpers
+
+
+def legacy_validate_uk_phone(phone):
+    if not phone:
+        return False
+    phone = str(phone).strip()
+    if phone.startswith('+44'):
+        phone = phone.replace('+44', '0', 1)
+    phone = re.sub(r'[^\d]', '', phone)
+    if not phone.startswith('0'):
+        return False
+    patterns = [
+        r'^0[1-2]\d{8,9}$',
+        r'^03\d{9}$',
+        r'^07\d{9}$',
+        r'^08\d{9}$',
+        r'^09\d{9}$'
+    ]
+    return any(re.match(pattern, phone) for pattern in patterns)
+
+
+def legacy_normalize_phone_number(phone):
+    phone = str(phone).strip()
+    if phone.startswith('+44'):
+        phone = phone.replace('+44', '0', 1)
+        phone = ''.join(filter(str.isdigit, phone))
+    else:
+        phone = ''.join(filter(str.isdigit, phone))
+    if phone and not phone.startswith('0') and len(phone) in [10, 11]:
+        phone = '0' + phone
+    return phone
+
+
+def legacy_validate_roll_number(roll):
+    if not roll:
+        return False
+    roll = str(roll).strip()
+    return bool(re.fullmatch(r"\d{7}", roll))
+
+
+def sample_values(count, seed=3):
+    """Mostly clean values with some formatted, international and invalid ones mixed in"""
+    rng = random.Random(seed)
+    phones, rolls = [], []
+    for _, contact, roll in generate_students(count, seed):
+        choice = rng.random()
+        if choice < 0.1:
+            contact = f"+44 {contact[1:5]} {contact[5:]}"
+        elif choice < 0.2:
+            contact = contact[1:]
+        elif choice < 0.25:
+            contact = contact[:6]
+        phones.append(contact)
+        rolls.append(roll if choice > 0.05 else roll[:5])
+    return phones, rolls
+
+
+def rate(fn, values):
+    start = time.perf_counter()
+    result = fn(values)
+    return len(values) / (time.perf_counter() - start), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validator throughput benchmark")
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    phones, rolls = sample_values(args.count)
+    cases = [
+        ("validate phone", phones,
+         lambda v: [legacy_validate_uk_phone(p) for p in v],
+         lambda v: [helpers.validate_uk_phone(p) for p in v],
+         helpers.validate_phones),
+        ("normalize phone", phones,
+         lambda v: [legacy_normalize_phone_number(p) for p in v],
+         lambda v: [helpers.normalize_uk_phone(p) for p in v],
+         helpers.normalize_phones),
+        ("validate roll", rolls,
+         lambda v: [legacy_validate_roll_number(r) for r in v],
+         lambda v: [helpers.validate_roll_number(r) for r in v],
+         helpers.validate_rolls),
+    ]
+
+    print(f"{args.count} values, values/sec")
+    print(f"  {'check':<17}{'legacy':>12}{'per value':>12}{'batch':>12}")
+    for label, values, legacy, single, batch in cases:
+        legacy_rate, expected = rate(legacy, values)
+        single_rate, single_result = rate(single, values)
+        batch_rate, batch_result = rate(batch, values)
+        if not (expected == single_result == batch_result):
+            raise SystemExit(f"{label}: results differ from the legacy implementation")
+        print(f"  {label:<17}{legacy_rate:>12.0f}{single_rate:>12.0f}{batch_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
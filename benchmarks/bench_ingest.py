@@ -0,0 +1,71 @@
+# benchmarks/bench_ingest.py
+#
+# Rows/sec of the parallel ingestion pipeline for different worker counts, against
+# the sequential bulk_import path.
+# Run from the project root:  python -m benchmarks.bench_ingest --rows 1000000 --workers 0 1 2 4 8
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import tempfile
+import time
+from benchmarks.datagen import build_database, generate_students
+from managers.student_manager import StudentManager
+
+
+def write_roster(path, count, seed=11):
+    """CSV roster with a few invalid and duplicate rows mixed in"""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "contact", "roll_number"])
+        previous = None
+        for name, contact, roll in generate_students(count, seed):
+            choice = rng.random()
+            if choice < 0.01:
+                contact = contact[:5]
+            elif choice < 0.02 and previous:
+                roll = previous
+            writer.writerow([name, contact, roll])
+            previous = roll
+    return path
+
+
+def fresh_manager(tmp, label):
+    db_path = os.path.join(tmp, f"{label}.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_database(db_path, 0)
+    return StudentManager(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion pipeline benchmark")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roster = write_roster(os.path.join(tmp, "roster.csv"), args.rows)
+        print(f"{args.rows} rows, {os.cpu_count()} CPU(s)")
+
+        manager = fresh_manager(tmp, "sequential")
+        start = time.perf_counter()
+        report = manager.bulk_import(roster)
+        sequential = time.perf_counter() - start
+        manager.close()
+        print(f"  {'bulk_import':<14}{args.rows / sequential:>12.0f} rows/s  ({report.summary()})")
+
+        for workers in sorted(set(args.workers)):
+            manager = fresh_manager(tmp, f"workers_{workers}")
+            report = manager.ingest(roster, workers=workers)
+            manager.close()
+            rate = report.throughput()["rows_per_s"]
+            print(f"  {f'{workers} worker(s)':<14}{rate:>12.0f} rows/s  x{sequential / report.elapsed:.2f}")
+            print("\n".join("    " + line for line in report.throughput_summary().splitlines()[1:]))
+
+
+if __name__ == "__main__":
+    main()
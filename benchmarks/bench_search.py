@@ -0,0 +1,65 @@
+# benchmarks/bench_search.py
+#
+# Times StudentManager.search_students against the old LIKE '%kw%' full scan.
+# Run from the project root:  python -m benchmarks.bench_search --sizes 10000 100000 1000000
+
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.datagen import build_database
+from managers.student_manager import StudentManager
+
+LIKE_SQL = """
+    SELECT * FROM students
+    WHERE name LIKE ? OR contact LIKE ? OR roll_number LIKE ?
+    ORDER BY name
+"""
+
+
+def sample_keywords(conn, count):
+    """Keywords taken from an existing row that exercise every search route"""
+    name, contact, roll = conn.execute(
+        "SELECT name, contact, roll_number FROM students WHERE id = ?", (count // 2 or 1,)).fetchone()
+    return {
+        "exact roll": roll,
+        "phone": contact,
+        "name fragment": name.split()[-1][1:5],
+        "phone digits": contact[3:8],
+        "short prefix": name[:2],
+    }
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = build_database(os.path.join(tmp, f"search_{size}.db"), size)
+            manager = StudentManager(db_path)
+            conn = manager.connect()
+
+            print(f"\n{size} students")
+            print(f"  {'query':<15}{'LIKE scan (ms)':>16}{'indexed (ms)':>15}{'rows':>8}")
+            for label, keyword in sample_keywords(conn, size).items():
+                pattern = f"%{keyword}%"
+                like_ms, _ = time_call(
+                    lambda: conn.execute(LIKE_SQL, (pattern, pattern, pattern)).fetchall(), args.repeat)
+                indexed_ms, rows = time_call(lambda: manager.search_students(keyword), args.repeat)
+                print(f"  {label:<15}{like_ms:>16.2f}{indexed_ms:>15.2f}{rows:>8}")
+
+            manager.close()
+
+
+if __name__ == "__main__":
+    main()
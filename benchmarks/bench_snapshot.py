@@ -0,0 +1,81 @@
+# benchmarks/bench_snapshot.py
+#
+# Cold-load cost of a reporting process: a fresh interpreter that loads every student
+# through get_all_students vs one that maps a snapshot, plus roll lookups and name-prefix
+# searches against both.
+# Run from the project root:  python -m benchmarks.bench_snapshot --rows 100000
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.datagen import build_database
+from managers.snapshot import Snapshot
+from managers.student_manager import StudentManager
+
+# Timed in a fresh interpreter; each prints the seconds spent after imports
+COLD_LOADS = {
+    "get_all_students": (
+        "import sys, time; from managers.student_manager import StudentManager; t = time.perf_counter();"
+        "rows = StudentManager(sys.argv[1]).get_all_students(); print(time.perf_counter() - t)"),
+    "snapshot": (
+        "import sys, time; from managers.snapshot import Snapshot; t = time.perf_counter();"
+        "s = Snapshot(sys.argv[2]); s.get_by_roll('0000000'); print(time.perf_counter() - t)"),
+}
+
+
+def cold_load(code, db_path, snapshot_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code, db_path, snapshot_path],
+                            cwd=root, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1])
+
+
+def per_call_us(fn, values):
+    start = time.perf_counter()
+    for value in values:
+        fn(value)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        snapshot_path = os.path.join(tmp, "bench.snapshot")
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_database(db_path, args.rows)
+        manager = StudentManager(db_path)
+
+        start = time.perf_counter()
+        manager.export_snapshot(snapshot_path)
+        print(f"{args.rows} rows: snapshot written in {time.perf_counter() - start:.2f}s, "
+              f"{os.path.getsize(snapshot_path) / 1e6:.1f} MB (database {os.path.getsize(db_path) / 1e6:.1f} MB)")
+
+        print("cold load in a fresh process")
+        for label, code in COLD_LOADS.items():
+            print(f"  {label:<18}{cold_load(code, db_path, snapshot_path) * 1000:>9.1f} ms")
+
+        rows = manager.get_all_students()
+        rng = random.Random(7)
+        rolls = [rows[rng.randrange(len(rows))][3] for _ in range(args.lookups)]
+        prefixes = [rows[rng.randrange(len(rows))][1][:3] for _ in range(args.lookups // 10)]
+        with Snapshot(snapshot_path) as snapshot:
+            print("per call")
+            print(f"  {'roll, sqlite':<18}{per_call_us(manager.get_student_by_roll, rolls):>9.1f} us")
+            print(f"  {'roll, snapshot':<18}{per_call_us(snapshot.get_by_roll, rolls):>9.1f} us")
+            print(f"  {'prefix, snapshot':<18}{per_call_us(snapshot.name_range, prefixes):>9.1f} us")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_startup.py
+#
+# Measures what `import main` costs before the login window can appear, using
+# python -X importtime, and fails when it exceeds the budget.
+# Run from the project root:  python -m benchmarks.bench_startup --budget-ms 50
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules that must stay off the pre-login path
+DEFERRED_MODULES = ("ttkbootstrap", "gui.main_screen", "managers.student_manager", "sqlite3")
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_imports(module="main"):
+    """Return [(module, self_us, cumulative_us, depth)] for a fresh interpreter importing module"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import-time benchmark")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="maximum cumulative import time of main")
+    parser.add_argument("--runs", type=int, default=5, help="take the best of this many runs")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        imports = measure_imports()
+        total = next(cumulative for name, _, cumulative, _ in imports if name == "main")
+        if best is None or total < best[0]:
+            best = (total, imports)
+    total_us, imports = best
+
+    print(f"import main: {total_us / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print("slowest modules (self time):")
+    for name, self_us, _, _ in sorted(imports, key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {name}")
+
+    loaded = {name for name, _, _, _ in imports}
+    eager = [name for name in DEFERRED_MODULES if name in loaded]
+    if eager:
+        print(f"FAIL: imported before login: {', '.join(eager)}")
+    if total_us / 1000 > args.budget_ms:
+        print("FAIL: over startup budget")
+    if eager or total_us / 1000 > args.budget_ms:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
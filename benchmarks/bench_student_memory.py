@@ -0,0 +1,55 @@
+# benchmarks/bench_student_memory.py
+#
+# Memory used by 1M students in each in-memory representation.
+# Run from the project root:  python -m benchmarks.bench_student_memory --count 1000000
+
+import argparse
+import gc
+import tracemalloc
+from benchmarks.datagen import generate_students
+from models.student import Student
+from models.student_batch import StudentBatch
+
+
+class LegacyStudent:
+    """The previous dict-backed Student model, kept here for comparison"""
+
+    def __init__(self, name, contact, roll_number, student_id=None):
+        self._id = student_id
+        self._name = name
+        self._contact = contact
+        self._roll_number = roll_number
+
+
+def rows_from_sqlite_like(count):
+    """Fresh string objects per row, as sqlite3 returns them"""
+    for student_id, (name, contact, roll) in enumerate(generate_students(count), start=1):
+        yield student_id, "".join(name), "".join(contact), "".join(roll)
+
+
+def measure(label, build, count):
+    gc.collect()
+    tracemalloc.start()
+    data = build(rows_from_sqlite_like(count))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28}{current / 1048576:>10.1f} MB{current / count:>10.0f} B/row")
+    del data
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Student representation memory benchmark")
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"{args.count} students")
+    baseline = measure("list of tuples", list, args.count)
+    measure("list of LegacyStudent", lambda rows: [LegacyStudent(n, c, r, i) for i, n, c, r in rows], args.count)
+    measure("list of slotted Student", lambda rows: [Student(n, c, r, i) for i, n, c, r in rows], args.count)
+    batch = measure("StudentBatch", StudentBatch.from_rows, args.count)
+    print(f"  StudentBatch vs tuples: {batch / baseline:.0%} of the memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/datagen.py
+
+import os
+import random
+import sqlite3
+from utils.db_init import initialize_database
+
+FIRST_NAMES = [
+    "Oliver", "Amelia", "George", "Isla", "Harry", "Ava", "Noah", "Mia", "Jack", "Ivy",
+    "Leo", "Freya", "Arthur", "Lily", "Muhammad", "Florence", "Oscar", "Grace", "Charlie", "Sophia",
+]
+LAST_NAMES = [
+    "Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Patel", "Robinson",
+    "Wright", "Thompson", "Evans", "Walker", "White", "Roberts", "Green", "Hall", "O'Neill", "Clarke-Hughes",
+]
+
+
+def generate_students(count, seed=42):
+    """Yield (name, contact, roll_number) tuples that pass the utils.helpers validators"""
+    rng = random.Random(seed)
+    rolls = rng.sample(range(1000000, 10000000), count)
+    for roll in rolls:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if rng.random() < 0.8:
+            contact = "07" + "".join(rng.choices("0123456789", k=9))
+        else:
+            contact = rng.choice(["01", "02"]) + "".join(rng.choices("0123456789", k=9))
+        yield name, contact, str(roll)
+
+
+def build_database(db_path, count, seed=42):
+    """Create a fresh database at db_path holding `count` synthetic students"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    initialize_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO students (name, contact, roll_number) VALUES (?, ?, ?)",
+            generate_students(count, seed),
+        )
+    conn.close()
+    return db_path
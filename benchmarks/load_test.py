@@ -0,0 +1,141 @@
+# benchmarks/load_test.py
+#
+# Load test for the HTTP API (student_records/server.py).
+# Run from the project root:  python -m benchmarks.load_test --rows 100000 --clients 32 --duration 10
+# Pass --url http://host:port to test an already running server instead of a temporary one.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+from benchmarks.datagen import build_database
+from student_records.server import StudentAPIServer
+
+# Relative weights of the request mix
+MIX = {"page": 4, "get": 4, "search": 3, "add": 1}
+
+SEARCH_TERMS = ["smith", "jo", "0770", "anne", "Taylor"]
+
+
+class Client:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Length: {len(payload)}\r\n\r\n").encode("latin-1") + payload)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+async def worker(client, deadline, samples, ids, words, rolls):
+    kinds = list(MIX)
+    weights = list(MIX.values())
+    while time.perf_counter() < deadline:
+        kind = random.choices(kinds, weights)[0]
+        if kind == "page":
+            args = ("GET", "/students?limit=50")
+        elif kind == "get":
+            args = ("GET", f"/students/{random.choice(ids)}")
+        elif kind == "search":
+            args = ("GET", f"/search?q={quote(random.choice(words))}&limit=50")
+        else:
+            roll = str(next(rolls))
+            args = ("POST", "/students", {"name": "Load Test", "contact": "07700900123", "roll_number": roll})
+
+        start = time.perf_counter()
+        status = await client.request(*args)
+        samples.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+        if status >= 500:
+            samples.setdefault("errors", []).append(status)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(samples, elapsed):
+    errors = len(samples.pop("errors", []))
+    everything = [ms for values in samples.values() for ms in values]
+    print(f"{'request':<10}{'count':>9}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for kind, values in sorted(samples.items()) + [("total", everything)]:
+        print(f"{kind:<10}{len(values):>9}{percentile(values, 50):>10.2f}"
+              f"{percentile(values, 99):>10.2f}{statistics.mean(values):>10.2f}")
+    print(f"\n{len(everything) / elapsed:.0f} requests/sec over {elapsed:.1f}s, {errors} server error(s)")
+
+
+async def run(host, port, clients, duration, ids, words):
+    # Roll numbers above the generated range so adds never collide
+    rolls = iter(range(9000000 + random.randrange(500000), 10000000))
+    samples = {}
+    connections = [Client(host, port) for _ in range(clients)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(c, start + duration, samples, ids, words, rolls) for c in connections))
+    finally:
+        for client in connections:
+            client.close()
+    report(samples, time.perf_counter() - start)
+
+
+async def run_local(db_path, args):
+    server = await StudentAPIServer(db_path, port=0, read_workers=args.read_workers).start()
+    try:
+        await run(server.host, server.port, args.clients, args.duration, list(range(1, args.rows + 1)),
+                  SEARCH_TERMS)
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API load test")
+    parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8080")
+    parser.add_argument("--rows", type=int, default=100000, help="rows in the temporary database")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--read-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        asyncio.run(run(url.hostname, url.port, args.clients, args.duration,
+                        list(range(1, args.rows + 1)), SEARCH_TERMS))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_database(os.path.join(tmp, "load.db"), args.rows)
+        asyncio.run(run_local(db_path, args))
+
+
+if __name__ == "__main__":
+    main()
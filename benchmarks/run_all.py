@@ -0,0 +1,270 @@
+# benchmarks/run_all.py
+#
+# Times every StudentManager method, the utils.helpers validators and initialize_database
+# on synthetic databases and writes the results as JSON, so runs from different commits
+# can be compared.
+# Run from the project root:
+#   python -m benchmarks.run_all --sizes 10000 100000 1000000 --output results.json
+#   python -m benchmarks.run_all --sizes 10000 --compare results.json
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_helpers import sample_values
+from benchmarks.bench_search import sample_keywords
+from benchmarks.datagen import build_database, generate_students
+from managers.student_manager import StudentManager
+from utils import helpers
+from utils.db_init import initialize_database
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# Slower than this much of the baseline best time counts as a regression with --compare,
+# unless the difference is below MIN_DELTA_MS (timer noise on sub-millisecond calls)
+DEFAULT_THRESHOLD = 1.25
+MIN_DELTA_MS = 0.05
+
+# Roll numbers below 1000000 are never produced by datagen, so write benchmarks can use them
+SPARE_ROLLS = (f"{n:07d}" for n in range(1, 1000000))
+
+
+def measure(fn, repeat, setup=None):
+    """Run fn `repeat` times (after an optional per-run setup) and return per-call timings in ms"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.mean(timings), 4),
+    }
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its progress messages (initialize_database prints) suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def prepare_database(data_dir, size):
+    """Reuse a database from an earlier run when it already holds `size` students"""
+    db_path = os.path.join(data_dir, f"students_{size}.db")
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            if conn.execute("SELECT COUNT(*) FROM students").fetchone()[0] == size:
+                return db_path
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+    return quiet(build_database, db_path, size)
+
+
+def manager_cases(manager, size, tmp):
+    """(name, fn, repeat, setup) for each StudentManager method on a database of `size` rows"""
+    conn = manager.connect()
+    keywords = sample_keywords(conn, size)
+    mid_id = size // 2 or 1
+    _, name, contact, roll = manager.get_student_by_id(mid_id)
+    deep_cursor = (name, mid_id)
+    full_scans = 3 if size >= 1000000 else 5
+
+    # The write cases share one spare row so the table is back to `size` rows afterwards
+    state = {}
+
+    def add():
+        state["roll"] = next(SPARE_ROLLS)
+        manager.add_student("Bench Mark", "07700900123", state["roll"])
+        state["id"] = manager.get_student_by_roll(state["roll"])[0]
+
+    def update():
+        manager.update_student(state["id"], "Bench Marked", "07700900124", state["roll"])
+
+    def delete():
+        manager.delete_student(state.pop("id"))
+
+    def ensure_row():
+        if "id" not in state:
+            add()
+
+    def drop_row():
+        if "id" in state:
+            delete()
+
+    import_path = os.path.join(tmp, "import.db")
+    import_rows = [{"name": n, "contact": c, "roll_number": r}
+                   for n, c, r in generate_students(min(size, 100000), seed=7)]
+
+    def fresh_import_db():
+        quiet(build_database, import_path, 0)
+        state["import"] = StudentManager(import_path)
+
+    def bulk_import():
+        state["import"].bulk_import(enumerate(import_rows, start=1))
+        state["import"].close()
+
+    export_path = os.path.join(tmp, "export.csv")
+    cases = [
+        ("connect", manager.connect, 1000, None),
+        ("count_students", manager.count_students, 20, None),
+        ("get_all_students", manager.get_all_students, full_scans, None),
+        ("iter_students", lambda: sum(len(chunk) for chunk in manager.iter_students()), full_scans, None),
+        ("get_students_page first", manager.get_students_page, 100, None),
+        ("get_students_page deep", lambda: manager.get_students_page(after=deep_cursor), 100, None),
+        ("get_student_by_id", lambda: manager.get_student_by_id(mid_id), 1000, None),
+        ("get_student_by_roll", lambda: manager.get_student_by_roll(roll), 1000, None),
+        ("validate_unique_roll", lambda: manager.validate_unique_roll(roll, exclude_id=mid_id), 1000, None),
+        ("uses_substring_match", lambda: manager.uses_substring_match(keywords["name fragment"]), 10000, None),
+        ("_normalize_phone_number", lambda: manager._normalize_phone_number(contact), 10000, None),
+    ]
+    for label, keyword in keywords.items():
+        cases.append((f"search_students {label}", lambda k=keyword: manager.search_students(k), 20, None))
+    cases += [
+        ("add_student", add, 50, drop_row),
+        ("update_student", update, 50, ensure_row),
+        ("delete_student", delete, 50, ensure_row),
+        ("export_to_csv", lambda: manager.export_to_csv(export_path), full_scans, None),
+        ("export_students jsonl", lambda: manager.export_students(export_path + ".jsonl"), full_scans, None),
+        ("export_students columnar", lambda: manager.export_students(export_path + ".json", fmt="columnar"),
+         full_scans, None),
+        (f"bulk_import {len(import_rows)} rows", bulk_import, 3, fresh_import_db),
+    ]
+    return cases
+
+
+def helper_cases(count):
+    phones, rolls = sample_values(count)
+    names = [name for name, _, _ in generate_students(count, seed=5)]
+    return [
+        ("validate_uk_phone", lambda: [helpers.validate_uk_phone(p) for p in phones]),
+        ("normalize_uk_phone", lambda: [helpers.normalize_uk_phone(p) for p in phones]),
+        ("format_uk_phone", lambda: [helpers.format_uk_phone(p) for p in phones]),
+        ("validate_roll_number", lambda: [helpers.validate_roll_number(r) for r in rolls]),
+        ("validate_student_name", lambda: [helpers.validate_student_name(n) for n in names]),
+        ("sanitize_input", lambda: [helpers.sanitize_input(n, 50) for n in names]),
+        ("validate_phones", lambda: helpers.validate_phones(phones)),
+        ("normalize_phones", lambda: helpers.normalize_phones(phones)),
+        ("validate_rolls", lambda: helpers.validate_rolls(rolls)),
+    ]
+
+
+def run(sizes, data_dir, helper_count, log):
+    results = []
+
+    def record(group, size, name, timing):
+        results.append({"group": group, "size": size, "case": name, **timing})
+        log(f"  {name:<34}{timing['median_ms']:>12.3f} ms")
+
+    log(f"helpers ({helper_count} values per call)")
+    for name, fn in helper_cases(helper_count):
+        record("helpers", helper_count, name, measure(fn, 5))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        new_db = os.path.join(tmp, "new.db")
+        log("initialize_database")
+        record("db_init", 0, "initialize_database new",
+               measure(lambda: quiet(initialize_database, new_db), 10, setup=lambda: _remove(new_db)))
+
+        for size in sizes:
+            log(f"\n{size} students")
+            db_path = prepare_database(data_dir or tmp, size)
+            record("db_init", size, "initialize_database current",
+                   measure(lambda: quiet(initialize_database, db_path), 20))
+
+            manager = StudentManager(db_path)
+            try:
+                for name, fn, repeat, setup in manager_cases(manager, size, tmp):
+                    record("student_manager", size, name, measure(fn, repeat, setup))
+            finally:
+                manager.close()
+    return results
+
+
+def _remove(path):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print best-time ratios against a previous run; returns the number of regressions"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["group"], r["size"], r["case"]): r["min_ms"] for r in baseline["results"]}
+
+    regressions = 0
+    print(f"\ncompared with {baseline_path} (commit {baseline['meta'].get('commit')})", file=sys.stderr)
+    for r in results:
+        before = previous.get((r["group"], r["size"], r["case"]))
+        if not before:
+            continue
+        ratio = r["min_ms"] / before
+        flag = ""
+        if ratio > threshold and r["min_ms"] - before > MIN_DELTA_MS:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {r['size']:>8} {r['case']:<34}{before:>10.3f} -> {r['min_ms']:>10.3f} ms"
+              f"  x{ratio:.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Student records benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--helper-count", type=int, default=100000, help="values per validator call")
+    parser.add_argument("--data-dir", help="keep generated databases here and reuse them between runs")
+    parser.add_argument("--output", help="JSON results file (default stdout)")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+
+    results = run(args.sizes, args.data_dir, args.helper_count, lambda text: print(text, file=sys.stderr))
+    report = {"meta": metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# gui/db_worker.py
+
+import queue
+import threading
+
+# How often (ms) the Tk thread checks for finished work
+POLL_INTERVAL = 25
+
+
+class Task:
+    """A unit of work submitted to DatabaseWorker"""
+
+    def __init__(self, fn, args, kwargs, key, on_done, on_error, quiet=False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.quiet = quiet
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class DatabaseWorker:
+    """
+    Runs StudentManager calls on a single background thread so the Tk mainloop never
+    blocks on the database. Results are handed back to the Tk thread by polling a queue
+    with root.after, since Tk widgets must only be touched from the thread that owns them.
+
+    Tasks submitted with the same key supersede each other: a queued task that has been
+    replaced never runs, and the result of a replaced running task is dropped.
+    """
+
+    def __init__(self, root, status_var=None, busy_text="Working..."):
+        self.root = root
+        self.status_var = status_var
+        self.busy_text = busy_text
+
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._latest = {}
+        self._pending = 0
+        self._busy = False
+        self._idle_text = ""
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="db-worker", daemon=True)
+        self._thread.start()
+        self._poll_id = self.root.after(POLL_INTERVAL, self._poll)
+
+    # ======== Tk thread API ========
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, quiet=False, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the background; on_done(result) is called on the Tk thread.
+        quiet tasks (e.g. periodic polling) do not show the busy cursor and status.
+        """
+        task = Task(fn, args, kwargs, key, on_done, on_error, quiet)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous:
+                previous.cancel()
+            self._latest[key] = task
+
+        if not quiet:
+            self._pending += 1
+            self._set_busy(True)
+        self._tasks.put(task)
+        return task
+
+    def cancel(self, key):
+        """Cancel the latest task submitted under key"""
+        task = self._latest.pop(key, None)
+        if task:
+            task.cancel()
+
+    def post(self, fn, *args):
+        """Schedule fn(*args) on the Tk thread; safe to call from the worker thread"""
+        self._results.put((fn, args))
+
+    def shutdown(self, timeout=2.0):
+        """Stop the worker thread after the task it is running finishes"""
+        self._stopped = True
+        self._tasks.put(None)
+        self._thread.join(timeout)
+        try:
+            self.root.after_cancel(self._poll_id)
+        except Exception:
+            pass
+
+    # ======== Internals ========
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            if task.cancelled:
+                self._results.put((self._finish, (task, None, None)))
+                continue
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+                self._results.put((self._finish, (task, result, None)))
+            except Exception as e:
+                self._results.put((self._finish, (task, None, e)))
+
+    def _finish(self, task, result, error):
+        if not task.quiet:
+            self._pending -= 1
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+
+        try:
+            if task.cancelled:
+                pass
+            elif error is not None:
+                if task.on_error:
+                    task.on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+            elif task.on_done:
+                task.on_done(result)
+        finally:
+            if self._pending == 0:
+                self._set_busy(False)
+
+    def _poll(self):
+        if self._stopped:
+            return
+        while True:
+            try:
+                fn, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Error handling background result: {e}")
+        self._poll_id = self.root.after(POLL_INTERVAL, self._poll)
+
+    def _set_busy(self, busy):
+        """Show busy state; the previous status text comes back unless a callback replaced it"""
+        if busy == self._busy:
+            return
+        self._busy = busy
+
+        try:
+            self.root.config(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
+        if self.status_var is None:
+            return
+        if busy:
+            self._idle_text = self.status_var.get()
+            self.status_var.set(self.busy_text)
+        elif self.status_var.get() == self.busy_text:
+            self.status_var.set(self._idle_text)
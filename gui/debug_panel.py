@@ -0,0 +1,77 @@
+# gui/debug_panel.py
+
+import ttkbootstrap as tb
+
+# How often (ms) the panel re-reads the instrumentation counters
+REFRESH_MS = 1000
+
+METHOD_COLUMNS = ("Method", "Calls", "p50 ms", "p99 ms", "Max ms", "Rows", "VM steps", "Failures")
+
+
+class DebugPanel:
+    """
+    Window with live StudentManager statistics: per-method latency, rows returned vs
+    SQLite VM steps, cache hit rate and the most recent slow queries with their plans.
+    Reads Instrumentation.snapshot() on the Tk thread every REFRESH_MS.
+    """
+
+    def __init__(self, root, manager):
+        self.manager = manager
+        self.instrumentation = manager.instrumentation
+
+        self.window = tb.Toplevel(root)
+        self.window.title("Debug - Live Statistics")
+        self.window.geometry("820x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.summary_var = tb.StringVar()
+        tb.Label(self.window, textvariable=self.summary_var, anchor=tb.W, padding=5).pack(fill=tb.X)
+
+        self.methods = tb.Treeview(self.window, columns=METHOD_COLUMNS, show='headings', height=10)
+        for column in METHOD_COLUMNS:
+            self.methods.heading(column, text=column)
+            self.methods.column(column, width=160 if column == "Method" else 80, anchor=tb.W if column == "Method" else tb.E)
+        self.methods.pack(fill=tb.X, padx=5, pady=5)
+
+        tb.Label(self.window, text="Slow queries (newest first)", anchor=tb.W, padding=(5, 0)).pack(fill=tb.X)
+        self.slow_text = tb.Text(self.window, height=12, wrap="word")
+        self.slow_text.pack(fill=tb.BOTH, expand=True, padx=5, pady=5)
+
+        button_frame = tb.Frame(self.window)
+        button_frame.pack(pady=5)
+        tb.Button(button_frame, text="Reset", bootstyle="secondary-outline", command=self.reset).grid(row=0, column=0, padx=5)
+        tb.Button(button_frame, text="Close", bootstyle="secondary", command=self.close).grid(row=0, column=1, padx=5)
+
+        self._after_id = None
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.instrumentation.snapshot()
+
+        self.methods.delete(*self.methods.get_children())
+        for name, stats in sorted(snapshot["methods"].items(), key=lambda item: -item[1]["total_ms"]):
+            self.methods.insert("", tb.END, values=(
+                name, stats["count"], stats["p50_ms"], stats["p99_ms"], stats["max_ms"],
+                stats["rows_returned"], stats["vm_steps"], stats["failures"]))
+
+        cache = self.manager.cache_metrics()
+        cache_text = f"cache hit rate {cache['hit_rate']:.0%} ({cache['rows']} rows)" if cache else "cache off"
+        statements = sum(stats["count"] for stats in snapshot["statements"].values())
+        self.summary_var.set(f"{statements} SQL statement(s), {snapshot['slow_query_count']} slow "
+                             f"(>= {self.instrumentation.slow_query_ms:g} ms), {cache_text}")
+
+        self.slow_text.delete("1.0", tb.END)
+        for query in reversed(snapshot["slow_queries"]):
+            plan = "\n    ".join(query["plan"] or ["(no plan)"])
+            self.slow_text.insert(tb.END, f"{query['method']}  {query['ms']:.1f} ms\n  {query['sql']}\n    {plan}\n\n")
+
+        self._after_id = self.window.after(REFRESH_MS, self.refresh)
+
+    def reset(self):
+        self.instrumentation.reset()
+
+    def close(self):
+        if self._after_id:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        self.window.destroy()
@@ -2,11 +2,14 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from gui.main_screen import MainScreen
+
+# gui.main_screen (and with it ttkbootstrap and the StudentManager) is imported only
+# after a successful login, so the login window can appear as quickly as possible.
 
 class LoginScreen:
-    def __init__(self, root):
+    def __init__(self, root, db_ready=None):
         self.root = root
+        self.db_ready = db_ready
         self.root.title("Student Management System - Login")
         self.root.geometry("300x180")
 
@@ -29,6 +32,17 @@ class LoginScreen:
 
         # Basic credentials (can be changed or moved to file later)
         if username == "admin" and password == "password":
+            from gui.main_screen import MainScreen
+
+            # Database initialization runs in the background while the user logs in
+            if self.db_ready is not None:
+                self.db_ready.join()
+                # Never open the main screen on a missing or half-migrated schema
+                error = getattr(self.db_ready, "error", None)
+                if error is not None:
+                    messagebox.showerror("Database Error", f"Could not initialize the database: {error}")
+                    return
+
             self.root.destroy()
             new_root = tk.Tk()
             MainScreen(new_root)
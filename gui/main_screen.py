@@ -4,18 +4,46 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from tkinter import messagebox, filedialog
 from managers.student_manager import StudentManager
+from gui.paged_table import PagedStudentTable
+from gui.db_worker import DatabaseWorker
+from managers.search_cache import SearchCache
+from managers.instrumentation import Instrumentation, LogSink
 from utils.helpers import validate_roll_number, validate_uk_phone, validate_student_name, format_uk_phone
 
+# Delay (ms) after the last keystroke before a live search runs
+SEARCH_DEBOUNCE_MS = 250
+
+# How often (ms) the table picks up changes made by other clients from the change log
+CHANGE_POLL_MS = 2000
+
 class MainScreen:
     def __init__(self, root):
         self.root = root
         self.root.title("Student Management System")
         self.root.geometry("750x500")
-        self.manager = StudentManager()
+        # Timings and slow-query plans for the debug panel (F12); slow queries are also logged
+        self.instrumentation = Instrumentation(sinks=[LogSink()])
+        self.manager = StudentManager(cache=True, instrumentation=self.instrumentation, dedup=True)
         self.selected_student_id = None
+        self.debug_panel = None
+
+        # All StudentManager calls run on this worker so the window never freezes
+        self.worker = DatabaseWorker(self.root)
+        self.search_cache = SearchCache(self.manager)
+        self._search_after_id = None
+
+        # Position in the change log the table is in sync with (None until the first load)
+        self.change_seq = None
+        self._changes_after_id = None
 
         self.build_ui()
+        self.worker.status_var = self.status_var
         self.populate_table()
+        self._changes_after_id = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+
+        # Release pooled database connections when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind('<F12>', lambda e: self.show_debug_panel())
 
     def build_ui(self):
         # ======== Form Section ========
@@ -59,21 +87,14 @@ class MainScreen:
         tb.Button(search_frame, text="Search", bootstyle=OUTLINE, command=self.search_student).grid(row=0, column=1, padx=5)
         tb.Button(search_frame, text="Show All", bootstyle="secondary-outline", command=self.populate_table).grid(row=0, column=2, padx=5)
 
-        # Bind Enter key to search
+        # Bind Enter key to search, and search live (debounced) while typing
         search_entry.bind('<Return>', lambda e: self.search_student())
+        self.search_var.trace_add('write', self.on_search_change)
 
         # ======== Student Table ========
-        self.tree = tb.Treeview(self.root, columns=("ID", "Name", "Contact", "Roll"), show='headings', bootstyle="dark")
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Name", text="Name")
-        self.tree.heading("Contact", text="Contact")
-        self.tree.heading("Roll", text="Roll Number")
-        self.tree.column("ID", width=40)
-        self.tree.column("Name", width=200)
-        self.tree.column("Contact", width=150)
-        self.tree.column("Roll", width=100)
-
-        self.tree.pack(pady=10, fill=tb.BOTH, expand=True)
+        # Only a window of pages is loaded; more are fetched while scrolling
+        self.table = PagedStudentTable(self.root, self.manager, worker=self.worker)
+        self.tree = self.table.tree
         self.tree.bind("<<TreeviewSelect>>", self.on_row_selected)
 
         # Add status bar
@@ -93,17 +114,50 @@ class MainScreen:
             pass
 
     def populate_table(self):
-        """Populate table with all students"""
-        # Clear existing data
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        students = self.manager.get_all_students()
-        for student in students:
-            self.tree.insert("", tb.END, values=student)
-        
-        # Update status
-        self.status_var.set(f"Showing {len(students)} student(s)")
+        """Show the first page of all students"""
+        self.worker.cancel("search")
+        self.worker.cancel("changes")
+        self.change_seq = None
+        # Read the log position before the first page; the worker runs tasks in order, so
+        # changes committed in between are replayed (harmlessly) rather than missed
+        self.worker.submit(self.manager.latest_change_seq, key="change-seq",
+                           on_done=lambda seq: setattr(self, "change_seq", seq))
+        self.table.reload()
+
+        # Update status from the summary tables (no table scan)
+        self.worker.submit(self.manager.stats, key="count",
+                           on_done=lambda stats: self.status_var.set(self.stats_summary(stats)))
+
+    @staticmethod
+    def stats_summary(stats):
+        """Status-bar text, e.g. "Showing 1200 student(s) - 81% mobile, 19% landline" """
+        total = stats["total"]
+        text = f"Showing {total} student(s)"
+        phone_types = sorted(stats.get("phone_type", {}).items(), key=lambda item: -item[1])
+        if total and phone_types:
+            text += " - " + ", ".join(f"{count / total:.0%} {phone_type}" for phone_type, count in phone_types[:3])
+        return text
+
+    def poll_changes(self):
+        """Patch the table with rows changed since the last poll instead of reloading it"""
+        self._changes_after_id = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+        if self.change_seq is None:
+            return
+        seq = self.change_seq
+        self.worker.submit(self.manager.changes_since, seq, key="changes", quiet=True,
+                           on_done=lambda result: self.on_changes(seq, *result))
+
+    def on_changes(self, seq, next_seq, changes):
+        if self.change_seq != seq:
+            # The table was reloaded while this poll was running
+            return
+        if changes is None:
+            # The log no longer reaches back to our position
+            self.change_seq = None
+            self.populate_table()
+            return
+        self.table.apply_changes(changes)
+        self.change_seq = next_seq
 
     def add_student(self):
         name = self.name_var.get().strip()
@@ -114,15 +168,12 @@ class MainScreen:
         if not self.validate_input(name, contact, roll):
             return
 
-        success, msg = self.manager.add_student(name, contact, roll)
-        if success:
-            self.populate_table()
-            self.clear_fields()
-            self.status_var.set("Student added successfully")
-            messagebox.showinfo("Success", msg)
-        else:
-            self.status_var.set("Failed to add student")
-            messagebox.showerror("Error", msg)
+        self._submit_add(name, contact, roll, allow_duplicate=False)
+
+    def _submit_add(self, name, contact, roll, allow_duplicate):
+        self.worker.submit(self._save_student, None, name, contact, roll, allow_duplicate,
+                           on_done=lambda result: self.on_student_saved(result, "add", "added",
+                                                                        retry=(name, contact, roll)))
 
     def update_student(self):
         if not self.selected_student_id:
@@ -134,17 +185,46 @@ class MainScreen:
         roll = self.roll_var.get().strip()
         
         # Enhanced validation
-        if not self.validate_input(name, contact, roll, is_update=True):
+        if not self.validate_input(name, contact, roll):
+            return
+
+        self.worker.submit(self._save_student, self.selected_student_id, name, contact, roll,
+                           on_done=lambda result: self.on_student_saved(result, "update", "updated"))
+
+    def _save_student(self, student_id, name, contact, roll, allow_duplicate=True):
+        """Runs on the worker thread: write (the UNIQUE constraint catches duplicate rolls), then re-read the saved row"""
+        if student_id is None:
+            success, msg = self.manager.add_student(name, contact, roll, allow_duplicate=allow_duplicate)
+            student = self.manager.get_student_by_roll(roll) if success else None
+        else:
+            success, msg = self.manager.update_student(student_id, name, contact, roll)
+            student = self.manager.get_student_by_id(student_id) if success else None
+        return success, msg, student
+
+    def on_student_saved(self, result, action, done, retry=None):
+        success, msg, student = result
+        if not success and msg.startswith("Roll number already exists"):
+            messagebox.showwarning(
+                "Duplicate Roll Number", 
+                "This roll number is already assigned to another student."
+            )
+            return
+
+        if not success and retry and msg.startswith("Possible duplicate"):
+            if messagebox.askyesno("Possible Duplicate", f"{msg}.\n\nAdd this student anyway?"):
+                self._submit_add(*retry, allow_duplicate=True)
+            else:
+                self.status_var.set("Student not added")
             return
 
-        success, msg = self.manager.update_student(self.selected_student_id, name, contact, roll)
         if success:
-            self.populate_table()
+            if student:
+                self.table.upsert_row(student)
             self.clear_fields()
-            self.status_var.set("Student updated successfully")
+            self.status_var.set(f"Student {done} successfully")
             messagebox.showinfo("Success", msg)
         else:
-            self.status_var.set("Failed to update student")
+            self.status_var.set(f"Failed to {action} student")
             messagebox.showerror("Error", msg)
 
     def delete_student(self):
@@ -161,50 +241,71 @@ class MainScreen:
                 f"Are you sure you want to delete student '{student_name}'?\n\nThis action cannot be undone."
             )
             if confirmed:
-                success, msg = self.manager.delete_student(self.selected_student_id)
-                if success:
-                    self.populate_table()
-                    self.clear_fields()
-                    self.status_var.set("Student deleted successfully")
-                    messagebox.showinfo("Success", msg)
-                else:
-                    self.status_var.set("Failed to delete student")
-                    messagebox.showerror("Error", msg)
+                student_id = self.selected_student_id
+                self.worker.submit(self.manager.delete_student, student_id,
+                                   on_done=lambda result: self.on_student_deleted(student_id, *result))
+
+    def on_student_deleted(self, student_id, success, msg):
+        if success:
+            self.table.remove_row(student_id)
+            self.clear_fields()
+            self.status_var.set("Student deleted successfully")
+            messagebox.showinfo("Success", msg)
+        else:
+            self.status_var.set("Failed to delete student")
+            messagebox.showerror("Error", msg)
+
+    def on_search_change(self, *args):
+        """Restart the debounce timer on every keystroke"""
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.search_student)
 
     def search_student(self):
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
         keyword = self.search_var.get().strip()
         if not keyword:
             self.populate_table()
             return
 
-        results = self.manager.search_students(keyword)
+        # A newer search replaces one that is still queued or running
+        self.worker.submit(self.search_cache.search, keyword, key="search",
+                           on_done=lambda results: self.show_search_results(keyword, results))
 
-        # Clear existing data
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def show_search_results(self, keyword, results):
+        self.table.show_rows(results)
 
-        for student in results:
-            self.tree.insert("", tb.END, values=student)
-        
         # Update status
         self.status_var.set(f"Found {len(results)} result(s) for '{keyword}'")
 
     def export_students(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+            filetypes=[("CSV Files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("Gzipped CSV", "*.csv.gz"), ("All Files", "*.*")],
             title="Export Student Data"
         )
         if file_path:
-            success = self.manager.export_to_csv(file_path)
-            if success:
-                self.status_var.set(f"Data exported to {file_path}")
-                messagebox.showinfo("Export Complete", f"Student data exported successfully to:\n{file_path}")
-            else:
-                self.status_var.set("Export failed")
-                messagebox.showerror("Export Failed", "Failed to export student data.")
+            self.worker.submit(self.manager.export_students, file_path, key="export",
+                               progress=self.on_export_progress,
+                               on_done=lambda written: self.on_export_done(file_path, written))
+
+    def on_export_progress(self, done, total):
+        """Called on the worker thread; hands the status update to the Tk thread"""
+        self.worker.post(self.status_var.set, f"Exporting... {done}/{total} student(s)")
+
+    def on_export_done(self, file_path, written):
+        if written is not None:
+            self.status_var.set(f"Exported {written} student(s) to {file_path}")
+            messagebox.showinfo("Export Complete", f"Student data exported successfully to:\n{file_path}")
+        else:
+            self.status_var.set("Export failed")
+            messagebox.showerror("Export Failed", "Failed to export student data.")
 
-    def validate_input(self, name, contact, roll, is_update=False):
+    def validate_input(self, name, contact, roll):
         """Enhanced input validation with better error messages"""
         if not name or not contact or not roll:
             messagebox.showwarning("Missing Information", "Please fill in all fields.")
@@ -238,21 +339,30 @@ class MainScreen:
             )
             return False
 
-        # Check roll number uniqueness
-        exclude_id = self.selected_student_id if is_update else None
-        if not self.manager.validate_unique_roll(roll, exclude_id):
-            messagebox.showwarning(
-                "Duplicate Roll Number", 
-                "This roll number is already assigned to another student."
-            )
-            return False
-
         return True
 
+    def show_debug_panel(self):
+        """Open (or raise) the live statistics window"""
+        if self.debug_panel and self.debug_panel.window.winfo_exists():
+            self.debug_panel.window.lift()
+            return
+        from gui.debug_panel import DebugPanel
+
+        self.debug_panel = DebugPanel(self.root, self.manager)
+
     def logout(self):
         confirmed = messagebox.askyesno("Logout", "Are you sure you want to logout?")
         if confirmed:
-            self.root.destroy()
+            self.on_close()
+
+    def on_close(self):
+        if self.debug_panel and self.debug_panel.window.winfo_exists():
+            self.debug_panel.close()
+        if self._changes_after_id:
+            self.root.after_cancel(self._changes_after_id)
+        self.worker.shutdown()
+        self.manager.close()
+        self.root.destroy()
 
     def clear_fields(self):
         """Clear all form fields and reset selection"""
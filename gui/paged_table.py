@@ -0,0 +1,197 @@
+# gui/paged_table.py
+
+import bisect
+import ttkbootstrap as tb
+from managers.student_manager import PAGE_SIZE
+
+# Pages kept in the Treeview at once; older pages are dropped as the user scrolls
+WINDOW_PAGES = 3
+
+# Scroll position (fraction of the loaded window) that triggers fetching the next page
+PREFETCH_EDGE = 0.15
+
+
+class PagedStudentTable:
+    """
+    Treeview that holds only a sliding window of students ordered by (name, id).
+    Pages are fetched with StudentManager.get_students_page as the user nears either
+    edge, and single-row changes are patched in place instead of reloading.
+    With a DatabaseWorker, pages are fetched in the background.
+    """
+
+    def __init__(self, parent, manager, page_size=PAGE_SIZE, worker=None):
+        self.manager = manager
+        self.page_size = page_size
+        self.worker = worker
+
+        frame = tb.Frame(parent)
+        frame.pack(pady=10, fill=tb.BOTH, expand=True)
+
+        self.tree = tb.Treeview(frame, columns=("ID", "Name", "Contact", "Roll"), show='headings', bootstyle="dark")
+        self.tree.heading("ID", text="ID")
+        self.tree.heading("Name", text="Name")
+        self.tree.heading("Contact", text="Contact")
+        self.tree.heading("Roll", text="Roll Number")
+        self.tree.column("ID", width=40)
+        self.tree.column("Name", width=200)
+        self.tree.column("Contact", width=150)
+        self.tree.column("Roll", width=100)
+
+        self.scrollbar = tb.Scrollbar(frame, orient=tb.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side=tb.RIGHT, fill=tb.Y)
+        self.tree.pack(side=tb.LEFT, fill=tb.BOTH, expand=True)
+
+        # Loaded window: rows and their (name, id) sort keys, kept in the same order
+        self.rows = []
+        self.keys = []
+        self.has_before = False
+        self.has_after = False
+        self.paged = True
+        self._loading = False
+
+    # ======== Loading ========
+
+    def reload(self, on_done=None):
+        """Show the first page of all students"""
+        self.paged = True
+        self._loading = True
+
+        def apply(rows):
+            self._loading = False
+            self._replace(rows)
+            self.has_before = False
+            self.has_after = len(rows) == self.page_size
+            self.tree.yview_moveto(0)
+            if on_done:
+                on_done(rows)
+
+        self._fetch(apply)
+
+    def show_rows(self, rows):
+        """Show a fixed result set (e.g. search results) with paging switched off"""
+        self.paged = False
+        self._loading = False
+        if self.worker:
+            self.worker.cancel("table-page")
+        self._replace(rows)
+        self.has_before = self.has_after = False
+        self.tree.yview_moveto(0)
+
+    def _fetch(self, on_rows, **cursor):
+        if self.worker:
+            self.worker.submit(self.manager.get_students_page, key="table-page", on_done=on_rows,
+                               limit=self.page_size, **cursor)
+        else:
+            on_rows(self.manager.get_students_page(limit=self.page_size, **cursor))
+
+    def _replace(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        self.rows = list(rows)
+        self.keys = [(row[1], row[0]) for row in self.rows]
+        for row in self.rows:
+            self.tree.insert("", tb.END, iid=str(row[0]), values=row)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.paged or self._loading:
+            return
+
+        if float(last) >= 1 - PREFETCH_EDGE and self.has_after:
+            self._loading = True
+            self._fetch(self._append_page, after=self.keys[-1])
+        elif float(first) <= PREFETCH_EDGE and self.has_before:
+            self._loading = True
+            self._fetch(self._prepend_page, before=self.keys[0])
+
+    def _append_page(self, rows):
+        self._loading = False
+        self.has_after = len(rows) == self.page_size
+        if not rows:
+            return
+
+        top = self._top_item()
+        for row in rows:
+            if not self.tree.exists(str(row[0])):
+                self.tree.insert("", tb.END, iid=str(row[0]), values=row)
+                self.rows.append(row)
+                self.keys.append((row[1], row[0]))
+
+        excess = len(self.rows) - self.page_size * WINDOW_PAGES
+        if excess > 0:
+            self.tree.delete(*[str(row[0]) for row in self.rows[:excess]])
+            del self.rows[:excess]
+            del self.keys[:excess]
+            self.has_before = True
+        self._restore_top(top)
+
+    def _prepend_page(self, rows):
+        self._loading = False
+        self.has_before = len(rows) == self.page_size
+        rows = [row for row in rows if not self.tree.exists(str(row[0]))]
+        if not rows:
+            return
+
+        top = self._top_item()
+        for index, row in enumerate(rows):
+            self.tree.insert("", index, iid=str(row[0]), values=row)
+        self.rows[:0] = rows
+        self.keys[:0] = [(row[1], row[0]) for row in rows]
+
+        excess = len(self.rows) - self.page_size * WINDOW_PAGES
+        if excess > 0:
+            self.tree.delete(*[str(row[0]) for row in self.rows[-excess:]])
+            del self.rows[-excess:]
+            del self.keys[-excess:]
+            self.has_after = True
+        self._restore_top(top)
+
+    def _top_item(self):
+        return self.tree.identify_row(1)
+
+    def _restore_top(self, item):
+        """Keep the row that was at the top of the view in place after rows were added/removed"""
+        if item and self.tree.exists(item) and self.rows:
+            self.tree.yview_moveto(self.tree.index(item) / len(self.rows))
+
+    # ======== Single-row updates ========
+
+    def upsert_row(self, row):
+        """Insert or move a changed row to its sorted position if it falls inside the window"""
+        self.remove_row(row[0])
+
+        key = (row[1], row[0])
+        index = bisect.bisect_left(self.keys, key)
+        # Rows sorting outside the loaded window will be fetched when paged into view
+        if (index == 0 and self.has_before) or (index == len(self.keys) and self.has_after):
+            return
+
+        self.rows.insert(index, row)
+        self.keys.insert(index, key)
+        self.tree.insert("", index, iid=str(row[0]), values=row)
+
+    def remove_row(self, student_id):
+        iid = str(student_id)
+        if not self.tree.exists(iid):
+            return
+        index = self.tree.index(iid)
+        self.tree.delete(iid)
+        del self.rows[index]
+        del self.keys[index]
+
+    def apply_changes(self, changes):
+        """
+        Patch the rows from StudentManager.changes_since: deleted students are removed and
+        changed ones moved to their sorted position. Fixed result sets (paging off) only
+        refresh rows they already show, since new rows may not match the search.
+        """
+        for _, _, student_id, row in changes:
+            if row is None:
+                self.remove_row(student_id)
+            elif self.paged:
+                self.upsert_row(row)
+            elif self.tree.exists(str(student_id)):
+                index = self.tree.index(str(student_id))
+                self.rows[index] = row
+                self.keys[index] = (row[1], row[0])
+                self.tree.item(str(student_id), values=row)
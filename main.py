@@ -1,16 +1,33 @@
 # main.py
 
+import threading
 import tkinter as tk
 from gui.login_screen import LoginScreen
-from utils.db_init import initialize_database
+
+class DatabaseInit(threading.Thread):
+    """Runs initialize_database in the background; error holds the exception if it failed"""
+
+    def __init__(self):
+        super().__init__(name="db-init", daemon=True)
+        self.error = None
+
+    def run(self):
+        try:
+            # Imported here so sqlite3 and the schema code load off the startup path
+            from utils.db_init import initialize_database
+            initialize_database()
+        except Exception as e:
+            self.error = e
 
 def main():
-    # Ensure the database and tables are set up
-    initialize_database()
+    # Ensure the database and tables are set up, in the background so the
+    # login window appears immediately; LoginScreen waits for it before continuing
+    db_ready = DatabaseInit()
+    db_ready.start()
 
     # Launch the login screen
     root = tk.Tk()
-    app = LoginScreen(root)
+    app = LoginScreen(root, db_ready=db_ready)
     root.mainloop()
 
 if __name__ == "__main__":
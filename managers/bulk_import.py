@@ -0,0 +1,367 @@
+# managers/bulk_import.py
+#
+# Streams a CSV or JSONL roster into the students table in large batches.
+# Run from the project root:  python -m managers.bulk_import roster.csv
+
+import argparse
+import csv
+import json
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from utils.db_init import stats_upsert_sql
+from utils.helpers import normalize_phones, validate_phones, validate_rolls, validate_student_name
+
+BATCH_SIZE = 10000
+
+INSERT_SQL = "INSERT INTO students (name, contact, roll_number) VALUES (?, ?, ?)"
+
+# Batches at least this big fill the search index, change log and statistics with one statement each
+# instead of per-row triggers
+DEFER_TRIGGERS_MIN_ROWS = 1000
+
+# RETURNING, used by UPSERT_SQL, needs SQLite 3.35.0 or newer
+UPSERT_MIN_SQLITE = (3, 35, 0)
+
+# Rows per multi-row upsert statement (3 parameters each, under SQLite's default 999 limit)
+UPSERT_CHUNK = 300
+
+UPSERT_SQL = """
+    INSERT INTO students (name, contact, roll_number) VALUES {values}
+    ON CONFLICT(roll_number) DO UPDATE SET name = excluded.name, contact = excluded.contact
+    WHERE students.name IS NOT excluded.name OR students.contact IS NOT excluded.contact
+    RETURNING id, roll_number
+"""
+
+# Accepted column headers / JSON keys, including the headers written by export_to_csv
+FIELD_ALIASES = {
+    "name": "name",
+    "contact": "contact",
+    "phone": "contact",
+    "roll": "roll_number",
+    "roll_number": "roll_number",
+    "roll number": "roll_number",
+}
+
+
+class ImportReport:
+    """Outcome of a bulk import: imported row count and per-row errors"""
+
+    def __init__(self):
+        self.imported = 0
+        self.errors = []  # (line number, message)
+
+    def add_error(self, line_no, message):
+        self.errors.append((line_no, message))
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    def summary(self):
+        return f"Imported {self.imported} student(s), {self.failed} row(s) rejected"
+
+
+def read_records(path):
+    """Yield (line number, record dict) pairs from a CSV or JSONL file without loading it all"""
+    with open(path, newline='', encoding="utf-8") as f:
+        yield from iter_records(f, path.lower().endswith((".jsonl", ".ndjson")))
+
+
+def iter_records(f, is_jsonl=False):
+    """Yield (line number, record dict) pairs from an open text file (e.g. sys.stdin)"""
+    if is_jsonl:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, _canonical_keys(json.loads(line))
+            except (ValueError, AttributeError):
+                yield line_no, None
+    else:
+        reader = csv.DictReader(f)
+        for record in reader:
+            # line_num points at the last physical line read, which is this record's line
+            yield reader.line_num, _canonical_keys(record)
+
+
+def _canonical_keys(record):
+    canonical = {}
+    for key, value in record.items():
+        field = FIELD_ALIASES.get(str(key).strip().lower())
+        if field:
+            canonical[field] = value
+    return canonical
+
+
+def validate_records(chunk):
+    """
+    Validate a list of (line number, record) pairs with the batch validators.
+    Returns (valid, errors): [(line number, (name, contact, roll))] and [(line number, message)].
+    """
+    lines, names, contacts, rolls, errors = [], [], [], [], []
+    for line_no, record in chunk:
+        if record is None:
+            errors.append((line_no, "Malformed record"))
+            continue
+
+        name = str(record.get("name") or "").strip()
+        contact = str(record.get("contact") or "").strip()
+        roll = str(record.get("roll_number") or "").strip()
+        if not name or not contact or not roll:
+            errors.append((line_no, "Missing name, contact or roll number"))
+            continue
+
+        lines.append(line_no)
+        names.append(name)
+        contacts.append(contact)
+        rolls.append(roll)
+
+    contacts = normalize_phones(contacts)
+    phones_ok = validate_phones(contacts)
+    rolls_ok = validate_rolls(rolls)
+
+    valid = []
+    for line_no, name, contact, roll, phone_ok, roll_ok in zip(lines, names, contacts, rolls, phones_ok, rolls_ok):
+        if not validate_student_name(name):
+            errors.append((line_no, f"Invalid name: {name!r}"))
+        elif not phone_ok:
+            errors.append((line_no, f"Invalid UK phone number: {contact!r}"))
+        elif not roll_ok:
+            errors.append((line_no, f"Invalid roll number: {roll!r}"))
+        else:
+            valid.append((line_no, (name, contact, roll)))
+
+    return valid, errors
+
+
+def import_records(conn, records, batch_size=BATCH_SIZE, report=None, jobs=1):
+    """
+    Validate (line number, record) pairs and insert the valid ones in executemany batches,
+    one transaction per batch. Invalid and duplicate rows are reported, not fatal.
+    With jobs > 1, chunks are validated in that many worker processes.
+    """
+    report = report or ImportReport()
+    known_rolls = existing_rolls(conn)
+
+    for valid, errors in _validated_chunks(records, batch_size, jobs):
+        write_validated(conn, valid, errors, known_rolls, report)
+
+    report.errors.sort()
+    return report
+
+
+def existing_rolls(conn):
+    return {roll for (roll,) in conn.execute("SELECT roll_number FROM students")}
+
+
+def write_validated(conn, valid, errors, known_rolls, report):
+    """
+    Record a validated chunk's errors and insert its rows whose roll number is not in
+    known_rolls (earlier rows win); returns the number of rows inserted.
+    """
+    for line_no, message in errors:
+        report.add_error(line_no, message)
+
+    batch = []
+    for line_no, row in valid:
+        roll = row[2]
+        if roll in known_rolls:
+            report.add_error(line_no, f"Roll number already exists: {roll}")
+            continue
+        known_rolls.add(roll)
+        batch.append((line_no, row))
+
+    before = report.imported
+    if batch:
+        _flush(conn, batch, report)
+    return report.imported - before
+
+
+def _validated_chunks(records, batch_size, jobs):
+    """Yield validate_records() results in file order, validating in parallel when jobs > 1"""
+    chunks = _chunked(records, batch_size)
+    if jobs <= 1:
+        yield from map(validate_records, chunks)
+        return
+
+    # Keep a bounded number of chunks in flight so huge files are not read into memory
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(validate_records, chunk))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def upsert_records(conn, records):
+    """
+    Insert or update students keyed on roll number, in one transaction.
+
+    records are (name, contact, roll_number) tuples or dicts. Returns one (outcome, detail)
+    pair per record, in order: ("inserted" | "updated" | "unchanged", student id), or
+    ("invalid" | "failed", message), or ("superseded", None) for an earlier record whose
+    roll number appears again later in the same call (the last one wins). Duplicates are
+    detected by the UNIQUE constraint through ON CONFLICT; each chunk of UPSERT_CHUNK rows
+    is written with one multi-row statement. Needs SQLite >= 3.35 (UPSERT_MIN_SQLITE).
+    """
+    if sqlite3.sqlite_version_info < UPSERT_MIN_SQLITE:
+        raise sqlite3.NotSupportedError(
+            f"Upsert needs SQLite {'.'.join(map(str, UPSERT_MIN_SQLITE))} or newer (found {sqlite3.sqlite_version})")
+    pairs = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            name, contact, roll = record
+            record = {"name": name, "contact": contact, "roll_number": roll}
+        pairs.append((index, record))
+
+    outcomes = [None] * len(pairs)
+    valid, errors = validate_records(pairs)
+    for index, message in errors:
+        outcomes[index] = ("invalid", message)
+
+    last_for_roll = {}
+    for index, row in valid:
+        previous = last_for_roll.get(row[2])
+        if previous is not None:
+            outcomes[previous] = ("superseded", None)
+        last_for_roll[row[2]] = index
+    rows = {index: row for index, row in valid}
+    pending = sorted(last_for_roll.values())
+
+    with conn:
+        for chunk in _chunked(pending, UPSERT_CHUNK):
+            chunk_rows = [rows[index] for index in chunk]
+            existing = _existing_rolls(conn, [row[2] for row in chunk_rows])
+            try:
+                sql = UPSERT_SQL.format(values=", ".join(["(?, ?, ?)"] * len(chunk_rows)))
+                written = dict((roll, student_id) for student_id, roll in
+                               conn.execute(sql, [value for row in chunk_rows for value in row]))
+            except sqlite3.IntegrityError:
+                # A CHECK constraint rejected something; retry one row at a time to find it
+                written = {}
+                for index, row in zip(chunk, chunk_rows):
+                    try:
+                        for student_id, roll in conn.execute(UPSERT_SQL.format(values="(?, ?, ?)"), row):
+                            written[roll] = student_id
+                    except sqlite3.IntegrityError as e:
+                        outcomes[index] = ("failed", f"Constraint failed: {e}")
+
+            for index, row in zip(chunk, chunk_rows):
+                if outcomes[index] is not None:
+                    continue
+                roll = row[2]
+                if roll in written:
+                    outcomes[index] = ("updated" if roll in existing else "inserted", written[roll])
+                else:
+                    outcomes[index] = ("unchanged", existing[roll])
+
+    return outcomes
+
+
+def _existing_rolls(conn, rolls):
+    placeholders = ", ".join("?" * len(rolls))
+    return dict(conn.execute(f"SELECT roll_number, id FROM students WHERE roll_number IN ({placeholders})", rolls))
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _flush(conn, batch, report):
+    """Insert one batch in its own transaction; constraint failures reject single rows"""
+    try:
+        report.imported += _insert_batch(conn, [row for _, row in batch])
+    except sqlite3.IntegrityError:
+        # Something in the batch violated a constraint (e.g. a concurrent insert); the
+        # batch was rolled back, so retry row by row and reject only the offending rows
+        for line_no, row in batch:
+            try:
+                with conn:
+                    conn.execute(INSERT_SQL, row)
+                report.imported += 1
+            except sqlite3.IntegrityError as e:
+                report.add_error(line_no, f"Constraint failed: {e}")
+
+
+def _insert_batch(conn, rows):
+    """Insert all rows in one transaction or none of them; returns the number inserted"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        triggers = _suspend_insert_triggers(conn) if len(rows) >= DEFER_TRIGGERS_MIN_ROWS else {}
+        first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+        conn.executemany(INSERT_SQL, rows)
+        # Do once for the whole batch what the suspended triggers would have done per row;
+        # AUTOINCREMENT ids only grow, so the new rows are exactly those past first_id
+        if "students_fts_insert" in triggers:
+            conn.execute("""
+                INSERT INTO students_fts(rowid, name, contact, roll_number)
+                SELECT id, name, contact, roll_number FROM students WHERE id > ?
+            """, (first_id,))
+        if "student_changes_insert" in triggers:
+            conn.execute("""
+                INSERT INTO student_changes(student_id, op)
+                SELECT id, 'insert' FROM students WHERE id > ? ORDER BY id
+            """, (first_id,))
+        if "student_stats_insert" in triggers:
+            conn.execute(stats_upsert_sql("s", 1, "FROM students s WHERE s.id > :first_id"), {"first_id": first_id})
+        for sql in triggers.values():
+            conn.execute(sql)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(rows)
+
+
+def _suspend_insert_triggers(conn):
+    """
+    Drop the per-row search index, change log and statistics triggers for the current
+    transaction and return {name: sql} so they can be recreated. Filling each with one
+    INSERT ... SELECT per batch is several times faster than firing them per row; DDL is
+    transactional, so other connections never see the triggers missing.
+    """
+    triggers = dict(conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'trigger' AND name IN ('students_fts_insert', 'student_changes_insert', 'student_stats_insert')
+    """))
+    for name in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    return triggers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import students from a CSV or JSONL roster")
+    parser.add_argument("path", help="CSV (name,contact,roll_number) or JSONL file")
+    parser.add_argument("--db", default="db/database.db", help="database path")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--max-errors", type=int, default=50, help="number of row errors to print")
+    args = parser.parse_args()
+
+    # Imported here so the module stays importable from StudentManager without a cycle
+    from managers.student_manager import StudentManager
+
+    manager = StudentManager(args.db)
+    try:
+        report = manager.bulk_import(args.path, batch_size=args.batch_size)
+    finally:
+        manager.close()
+
+    for line_no, message in report.errors[:args.max_errors]:
+        print(f"line {line_no}: {message}")
+    if report.failed > args.max_errors:
+        print(f"... {report.failed - args.max_errors} more error(s)")
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# managers/connection_pool.py
+
+import sqlite3
+import threading
+
+# Pragmas applied once to every new connection
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,      # ~16 MB page cache (negative = KiB)
+    "mmap_size": 134217728,    # 128 MB memory-mapped I/O
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+# Number of compiled statements sqlite3 keeps per connection
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionPool:
+    """
+    Hands out one long-lived connection per thread for a single database file.
+    Connections are opened lazily, tuned with DEFAULT_PRAGMAS and kept until close_all().
+    on_connect, if set, is called with each new connection (e.g. to install trace hooks).
+    """
+
+    def __init__(self, db_path, pragmas=None, on_connect=None):
+        self.db_path = db_path
+        self.on_connect = on_connect
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._closed = False
+
+    def get(self):
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool has been closed")
+
+            # Each connection is only ever used by the thread that opened it;
+            # check_same_thread is relaxed so close_all() can run from any thread.
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            self._configure(conn)
+            if self.on_connect:
+                self.on_connect(conn)
+            self._connections.append(conn)
+
+        self._local.conn = conn
+        return conn
+
+    def release_current(self):
+        """Close the calling thread's connection, e.g. before a short-lived thread exits"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def _configure(self, conn):
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+    def close_all(self):
+        """Close every connection handed out by this pool"""
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing connection: {e}")
+
+        self._local = threading.local()
@@ -0,0 +1,298 @@
+# managers/dedup.py
+#
+# Finds students entered more than once under different roll numbers. Comparing every
+# pair is out of the question at 500k rows, so each student gets a few blocking keys:
+#
+#   c:<normalized phone>          same number, whatever format it was typed in
+#   t:<last PHONE_TAIL digits>    same number with a mistyped area code
+#   s:<soundex>|<soundex>         first and last name sound alike (order-insensitive)
+#   p:<prefix>|<prefix>           first NAME_PREFIX letters of first and last name
+#
+# and only students sharing a key are scored against each other. Keys live in the
+# student_match_keys table and are kept current from the change log (student_changes),
+# so any writer, including bulk imports, is picked up by the next sync().
+
+import difflib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from utils.helpers import normalize_uk_phone
+
+# Pairs scoring at least this are reported as likely duplicates
+MATCH_THRESHOLD = 0.8
+
+# Weight of name similarity in the score; the phone makes up the rest
+NAME_WEIGHT = 0.7
+
+# Name keys shared by more students than this are too common to tell anyone apart
+MAX_BLOCK_SIZE = 200
+
+# Letters of each name part used for the prefix key
+NAME_PREFIX = 3
+
+# Trailing digits that count as a partial phone match (e.g. 020 vs 0207 area code typos)
+PHONE_TAIL = 7
+
+# Rows keyed, or blocks scored, per task in the batch job
+TASK_SIZE = 5000
+
+_NON_LETTER_RE = re.compile(r"[^a-z\s]")
+_SOUNDEX_CODES = {letter: str(code) for code, letters in enumerate(
+    ("aehiouwy", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r")) for letter in letters}
+
+
+def name_tokens(name):
+    """Lower-case name parts with apostrophes and hyphens removed ("O'Neill" -> "oneill")"""
+    return _NON_LETTER_RE.sub("", str(name).lower().replace("-", "")).split()
+
+
+def soundex(word):
+    """Four-character American Soundex code ("robert" -> "r163")"""
+    if not word:
+        return ""
+    codes = [_SOUNDEX_CODES.get(letter, "0") for letter in word]
+    result = word[0]
+    previous = codes[0]
+    for letter, code in zip(word[1:], codes[1:]):
+        if code != "0" and code != previous:
+            result += code
+        # h and w do not separate letters with the same code; vowels do
+        if letter not in "hw":
+            previous = code
+    return (result + "000")[:4]
+
+
+def match_keys(name, contact):
+    """Blocking keys for one student"""
+    keys = set()
+    phone = normalize_uk_phone(contact)
+    if phone:
+        keys.add(f"c:{phone}")
+        keys.add(f"t:{phone[-PHONE_TAIL:]}")
+
+    tokens = name_tokens(name)
+    if tokens:
+        ends = (tokens[0], tokens[-1])
+        keys.add("s:" + "|".join(sorted(soundex(token) for token in ends)))
+        keys.add("p:" + "|".join(sorted(token[:NAME_PREFIX] for token in ends)))
+    return keys
+
+
+def prepare(name, contact):
+    """Normalized (name, phone) used for scoring; names sorted so word order does not matter"""
+    return " ".join(sorted(name_tokens(name))), normalize_uk_phone(contact)
+
+
+def phone_score(phone_a, phone_b):
+    if phone_a == phone_b:
+        return 1.0
+    if phone_a[-PHONE_TAIL:] == phone_b[-PHONE_TAIL:]:
+        return 0.6
+    return 0.0
+
+
+def score(a, b, threshold=0.0):
+    """
+    Similarity of two prepare()d (name, phone) pairs between 0 and 1. Pairs that cannot
+    reach threshold score 0 without running the full name comparison.
+    """
+    phone = (1 - NAME_WEIGHT) * phone_score(a[1], b[1])
+    if NAME_WEIGHT + phone < threshold:
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, a[0], b[0])
+    # quick_ratio() is a cheap upper bound of ratio()
+    if NAME_WEIGHT * matcher.quick_ratio() + phone < threshold:
+        return 0.0
+    return NAME_WEIGHT * matcher.ratio() + phone
+
+
+def keys_for_rows(rows):
+    """Worker task: (student_id, key) pairs for (student_id, name, contact) rows"""
+    return [(student_id, key) for student_id, name, contact in rows for key in match_keys(name, contact)]
+
+
+def score_blocks(blocks, threshold):
+    """Worker task: (score, id_a, id_b) for pairs within each block scoring >= threshold"""
+    matches = []
+    for members in blocks:
+        prepared = [(student_id, prepare(name, contact)) for student_id, name, contact in members]
+        for i, (id_a, a) in enumerate(prepared):
+            for id_b, b in prepared[i + 1:]:
+                value = score(a, b, threshold)
+                if value >= threshold:
+                    matches.append((round(value, 3), min(id_a, id_b), max(id_a, id_b)))
+    return matches
+
+
+def group_pairs(pairs):
+    """Merge (score, id_a, id_b) pairs into sorted clusters of ids that are duplicates of each other"""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for _, a, b in pairs:
+        parent[find(a)] = find(b)
+
+    groups = {}
+    for x in parent:
+        groups.setdefault(find(x), []).append(x)
+    return sorted(sorted(group) for group in groups.values())
+
+
+class DedupEngine:
+    """
+    Duplicate detection over a StudentManager's database.
+
+    find_matches() checks one (name, contact) against the students sharing a blocking key
+    (used before add_student); find_all() is the batch job that scores every block, in
+    worker processes when workers > 1.
+    """
+
+    def __init__(self, manager, threshold=MATCH_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+        self.manager = manager
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+
+    # ======== Key maintenance ========
+
+    def sync(self, workers=1):
+        """Bring student_match_keys up to date with the change log; returns students re-keyed"""
+        conn = self.manager.connect()
+        seq = conn.execute("SELECT change_seq FROM dedup_state").fetchone()[0]
+        if seq < 0:
+            return self.rebuild(workers)
+
+        updated = 0
+        while True:
+            next_seq, changes = self.manager.changes_since(seq)
+            if changes is None:
+                # The log was pruned past our position
+                return self.rebuild(workers)
+            if not changes:
+                return updated
+
+            ids = [(student_id,) for _, _, student_id, _ in changes]
+            rows = [(row[0], row[1], row[2]) for _, _, _, row in changes if row is not None]
+            with conn:
+                conn.executemany("DELETE FROM student_match_keys WHERE student_id = ?", ids)
+                conn.executemany("INSERT OR IGNORE INTO student_match_keys (key, student_id) VALUES (?, ?)",
+                                 [(key, student_id) for student_id, key in keys_for_rows(rows)])
+                # Only move forward; a concurrent sync may already be further along
+                conn.execute("UPDATE dedup_state SET change_seq = MAX(change_seq, ?)", (next_seq,))
+            updated += len(changes)
+            seq = next_seq
+
+    def rebuild(self, workers=1):
+        """Recompute every student's keys (in worker processes when workers > 1); returns students keyed"""
+        # Taken first, so changes made while we read are replayed by the next sync
+        seq = self.manager.latest_change_seq()
+        conn = self.manager.connect()
+
+        def chunks():
+            for batch in self.manager.iter_students(TASK_SIZE):
+                yield [(student_id, name, contact) for student_id, name, contact, _ in batch]
+
+        with conn:
+            conn.execute("DELETE FROM student_match_keys")
+            count = 0
+            for pairs in _map(keys_for_rows, chunks(), workers):
+                conn.executemany("INSERT OR IGNORE INTO student_match_keys (key, student_id) VALUES (?, ?)",
+                                 [(key, student_id) for student_id, key in pairs])
+                count += len({student_id for student_id, _ in pairs})
+            conn.execute("UPDATE dedup_state SET change_seq = ?", (seq,))
+        return count
+
+    # ======== Matching ========
+
+    def find_matches(self, name, contact, exclude_id=None):
+        """
+        Students likely to be the same person as (name, contact), best first, as
+        (score, row) pairs. Keys are synced first, so this costs O(changes + block size).
+        """
+        self.sync()
+        conn = self.manager.connect()
+        candidates = set()
+        for key in match_keys(name, contact):
+            ids = [student_id for (student_id,) in conn.execute(
+                "SELECT student_id FROM student_match_keys WHERE key = ? LIMIT ?", (key, self.max_block_size + 1))]
+            # Oversized blocks (very common names) cannot tell anyone apart and are skipped
+            if len(ids) <= self.max_block_size:
+                candidates.update(ids)
+        candidates.discard(int(exclude_id) if exclude_id is not None else None)
+
+        target = prepare(name, contact)
+        matches = []
+        for student_id in candidates:
+            row = self.manager.get_student_by_id(student_id)
+            if row:
+                value = score(target, prepare(row[1], row[2]), self.threshold)
+                if value >= self.threshold:
+                    matches.append((round(value, 3), row))
+        matches.sort(key=lambda match: (-match[0], match[1][0]))
+        return matches
+
+    def find_all(self, workers=1):
+        """
+        Batch job: every pair of students sharing a block and scoring >= threshold, as
+        (score, id_a, id_b) sorted best first. Blocks are scored in worker processes
+        when workers > 1.
+        """
+        self.sync(workers)
+        tasks = _block_tasks(self.manager.connect(), self.max_block_size)
+        best = {}
+        for matches in _map(score_blocks, tasks, workers, self.threshold):
+            for value, a, b in matches:
+                # The same pair can share several blocks
+                best[(a, b)] = max(value, best.get((a, b), 0))
+        return sorted(((value, a, b) for (a, b), value in best.items()), key=lambda pair: (-pair[0], pair[1:]))
+
+
+def _block_tasks(conn, max_block_size):
+    """Stream blocks of (student_id, name, contact) members, TASK_SIZE members per task"""
+    cursor = conn.execute("""
+        SELECT k.key, s.id, s.name, s.contact
+        FROM student_match_keys k JOIN students s ON s.id = k.student_id
+        WHERE k.key IN (
+            SELECT key FROM student_match_keys GROUP BY key
+            HAVING COUNT(*) BETWEEN 2 AND ?
+        )
+        ORDER BY k.key
+    """, (max_block_size,))
+
+    task, size, block, current = [], 0, [], None
+    for key, student_id, name, contact in cursor:
+        if key != current:
+            if block:
+                task.append(block)
+                size += len(block)
+            if size >= TASK_SIZE:
+                yield task
+                task, size = [], 0
+            block, current = [], key
+        block.append((student_id, name, contact))
+    if block:
+        task.append(block)
+    if task:
+        yield task
+
+
+def _map(fn, tasks, workers, *args):
+    """Yield fn(task, *args) for each task, in order, on worker processes when workers > 1"""
+    if workers <= 1:
+        for task in tasks:
+            yield fn(task, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for task in tasks:
+            pending.append(executor.submit(fn, task, *args))
+            # Keep a bounded number of tasks in flight
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
@@ -0,0 +1,92 @@
+# managers/exporter.py
+#
+# Incremental writers used by StudentManager.export_students. Rows arrive in chunks
+# straight from the database cursor, so memory stays flat regardless of table size.
+
+import csv
+import gzip
+import json
+from models.student_batch import StudentBatch
+
+# Column key -> header used in exported files (order matches the students table)
+EXPORT_COLUMNS = {
+    "id": "ID",
+    "name": "Name",
+    "contact": "Contact",
+    "roll_number": "Roll Number",
+}
+COLUMN_INDEX = {key: index for index, key in enumerate(EXPORT_COLUMNS)}
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+
+def detect_format(filepath):
+    """Pick an export format from the file extension (a trailing .gz is ignored)"""
+    path = filepath.lower()
+    if path.endswith(".gz"):
+        path = path[:-3]
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if path.endswith(".columnar"):
+        return "columnar"
+    return "csv"
+
+
+def open_output(filepath):
+    """Open filepath for text writing, gzip-compressed when it ends in .gz"""
+    if filepath.lower().endswith(".gz"):
+        return gzip.open(filepath, "wt", newline='', encoding="utf-8")
+    return open(filepath, "w", newline='', encoding="utf-8")
+
+
+def resolve_columns(columns=None):
+    """Validate a column selection, defaulting to every column"""
+    if not columns:
+        return list(EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export column(s): {', '.join(unknown)}")
+    return list(columns)
+
+
+def write_chunks(f, chunks, fmt="csv", columns=None, predicate=None, progress=None, total=None):
+    """
+    Write chunks of (id, name, contact, roll) rows to an open file.
+    predicate(row) filters rows; progress(rows_processed, total) is called once per chunk.
+    Returns the number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    columns = resolve_columns(columns)
+    indexes = [COLUMN_INDEX[c] for c in columns]
+    all_columns = indexes == list(range(len(EXPORT_COLUMNS)))
+
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow([EXPORT_COLUMNS[c] for c in columns])
+
+    written = processed = 0
+    for row_group, chunk in enumerate(chunks):
+        if not isinstance(chunk, StudentBatch):
+            chunk = StudentBatch.from_rows(chunk)
+        processed += len(chunk)
+        if predicate:
+            chunk = chunk.filter(predicate)
+
+        if fmt == "columnar":
+            # Parquet-like layout: one JSON row group per line, values stored column by column
+            if chunk:
+                data = {column: list(chunk.column(column)) for column in columns}
+                f.write(json.dumps({"row_group": row_group, "num_rows": len(chunk), "columns": data}) + "\n")
+        else:
+            rows = chunk if all_columns else [tuple(row[i] for i in indexes) for row in chunk]
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+
+        written += len(chunk)
+        if progress:
+            progress(processed, total)
+
+    return written
@@ -0,0 +1,172 @@
+# managers/group_commit.py
+#
+# Write-behind queue that turns many small concurrent writes into a few transactions.
+# Every commit costs at least one fsync, so under bursts (enrolment day, many clerks)
+# committing N queued writes together is close to N times the throughput of committing
+# each one, while every caller still waits for, and gets, its own result.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Durability modes -> PRAGMA synchronous on the writer connection, and whether writes are grouped
+#   full     each write is its own transaction, fsynced before the caller returns
+#   grouped  queued writes share a transaction, fsynced before any of their callers return
+#   relaxed  grouped, but commits are only fsynced at WAL checkpoints: a power loss can
+#            drop the last acknowledged writes (an application crash cannot)
+DURABILITY = {
+    "full": ("FULL", False),
+    "grouped": ("FULL", True),
+    "relaxed": ("NORMAL", True),
+}
+
+# Most writes committed in one transaction
+MAX_BATCH = 256
+
+# How long (ms) the first write of a group waits for others to join it
+MAX_LATENCY_MS = 2.0
+
+
+class GroupCommitQueue:
+    """
+    Single writer thread that runs queued write operations in shared transactions.
+
+    An operation is op(conn, *args) -> (success, msg, after_commit). It runs inside the
+    group's transaction and must be one statement, or leave nothing behind when it fails,
+    since a failing operation only fails itself. after_commit (or None) runs once the
+    group has committed, e.g. to update caches. If the commit itself fails, every
+    operation in the group fails with the commit error.
+    """
+
+    def __init__(self, pool, durability="grouped", max_batch=MAX_BATCH, max_latency_ms=MAX_LATENCY_MS):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY)}")
+        self.pool = pool
+        self.durability = durability
+        self.synchronous, grouped = DURABILITY[durability]
+        self.max_batch = max_batch if grouped else 1
+        self.max_latency = max_latency_ms / 1000 if grouped else 0
+
+        # Counters for tuning max_batch / max_latency_ms
+        self.commits = 0
+        self.writes = 0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        # Serializes submit() with close() and the writer's shutdown, so no write can be
+        # queued after the writer has stopped taking them
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, op, *args):
+        """Queue op(conn, *args) and block until its group commits; returns (success, msg)"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                return False, "Database error: write queue has been closed"
+            self._queue.put((op, args, future))
+        return future.result()
+
+    def metrics(self):
+        return {"durability": self.durability, "commits": self.commits, "writes": self.writes,
+                "writes_per_commit": round(self.writes / self.commits, 2) if self.commits else 0.0}
+
+    def close(self, timeout=5.0):
+        """Commit what is already queued, then stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ======== Writer thread ========
+
+    def _run(self):
+        error = "write queue has been closed"
+        batch = []
+        try:
+            conn = self.pool.get()
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    break
+                batch, stop = self._gather(first)
+                self._commit(conn, batch)
+                if stop:
+                    break
+        except Exception as e:
+            error = f"write queue stopped: {e}"
+            print(f"Group commit writer failed: {e}")
+        finally:
+            self._fail_pending(error, batch)
+            self.pool.release_current()
+
+    def _fail_pending(self, error, batch):
+        """
+        Stop accepting writes and fail every one still unanswered, in the interrupted
+        batch or the queue, so no caller waits forever
+        """
+        with self._lock:
+            self._closed = True
+        pending = list(batch)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+        for _, _, future in pending:
+            if not future.done():
+                future.set_result((False, f"Database error: {error}"))
+
+    def _gather(self, first):
+        """Collect writes already queued, waiting up to max_latency for more; returns (batch, stop)"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, _ in batch:
+                try:
+                    results.append(op(conn, *args))
+                except Exception as e:
+                    results.append((False, f"Database error: {e}", None))
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for _, _, future in batch:
+                future.set_result((False, f"Database error: {e}"))
+            return
+
+        self.commits += 1
+        self.writes += len(batch)
+        for (_, _, future), (success, msg, after_commit) in zip(batch, results):
+            if after_commit:
+                try:
+                    after_commit()
+                except Exception as e:
+                    print(f"Error after commit: {e}")
+            future.set_result((success, msg))
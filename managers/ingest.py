@@ -0,0 +1,261 @@
+# managers/ingest.py
+#
+# Parallel ingestion pipeline for very large rosters:
+#
+#   reader thread  ->  blocks of raw lines  ->  worker processes        ->  writer thread
+#   (file I/O only)    (bounded queue)          (CSV/JSON parse and         (one SQLite connection,
+#                                               validate_records)           executemany per block)
+#
+# Parsing and validation are the CPU-bound part, so they run in a ProcessPoolExecutor;
+# the reader only splits the file into line blocks and the writer is the single SQLite
+# writer. Bounded queues between the stages keep memory flat on multi-million-row files.
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from managers.bulk_import import ImportReport, _canonical_keys, existing_rolls, validate_records, write_validated
+
+# Rows per block handed to a worker (and per write transaction)
+CHUNK_SIZE = 20000
+
+# Blocks allowed to wait between stages, per worker
+QUEUE_BLOCKS_PER_WORKER = 2
+
+# Seconds a blocked stage waits before re-checking whether another stage failed
+_POLL = 0.1
+
+_DONE = object()
+
+
+class StageStats:
+    """Rows handled and busy time of one pipeline stage (the read stage counts lines)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.busy = 0.0
+
+    @property
+    def rate(self):
+        return self.rows / self.busy if self.busy else 0.0
+
+    def summary(self):
+        return {"rows": self.rows, "busy_s": round(self.busy, 3), "rows_per_busy_s": round(self.rate)}
+
+
+class PipelineReport(ImportReport):
+    """ImportReport plus per-stage throughput"""
+
+    def __init__(self, workers=0):
+        super().__init__()
+        self.workers = workers
+        self.elapsed = 0.0
+        self.stages = {name: StageStats(name) for name in ("read", "validate", "write")}
+
+    def throughput(self):
+        """Overall rows/sec plus each stage's rows per second of busy time"""
+        rows = self.stages["validate"].rows
+        return {
+            "workers": self.workers,
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_s": round(rows / self.elapsed) if self.elapsed else 0,
+            "stages": {name: stage.summary() for name, stage in self.stages.items()},
+        }
+
+    def throughput_summary(self):
+        lines = [f"{self.stages['validate'].rows} row(s) in {self.elapsed:.2f}s with {self.workers} worker(s)"]
+        for stage in self.stages.values():
+            lines.append(f"  {stage.name:<9}{stage.rows:>10} rows {stage.busy:>8.2f}s busy {stage.rate:>12.0f} rows/s")
+        if self.stages["validate"].busy:
+            lines.append("  (validate busy time is summed over all worker processes)")
+        return "\n".join(lines)
+
+
+def read_blocks(f, chunk_size, is_jsonl):
+    """
+    Yield (fieldnames, first line number, lines) blocks of about chunk_size records.
+    CSV blocks only end where the running quote count is even, so a quoted field that
+    spans lines is never split between blocks; JSONL blocks end at any line.
+    """
+    line_no = 0
+    fieldnames = None
+    if not is_jsonl:
+        header = f.readline()
+        if not header:
+            return
+        line_no = 1
+        fieldnames = next(csv.reader([header]))
+
+    lines = []
+    start = line_no + 1
+    open_quotes = False
+    for line in f:
+        line_no += 1
+        lines.append(line)
+        # JSONL records are one per line; '"' counts only matter for CSV
+        if not is_jsonl and line.count('"') % 2:
+            open_quotes = not open_quotes
+        if len(lines) >= chunk_size and not open_quotes:
+            yield fieldnames, start, lines
+            lines = []
+            start = line_no + 1
+    if lines:
+        yield fieldnames, start, lines
+
+
+def parse_and_validate(fieldnames, start, lines):
+    """Worker-process stage: parse one block and validate it; returns (valid, errors, rows, cpu seconds)"""
+    began = time.process_time()
+    records = []
+    if fieldnames is None:
+        for offset, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                records.append((start + offset, _canonical_keys(json.loads(line))))
+            except (ValueError, AttributeError):
+                records.append((start + offset, None))
+    else:
+        reader = csv.reader(lines)
+        for row in reader:
+            if row:
+                # Same numbering as csv.DictReader.line_num: the record's last physical line
+                records.append((start + reader.line_num - 1, _canonical_keys(dict(zip(fieldnames, row)))))
+
+    valid, errors = validate_records(records)
+    return valid, errors, len(records), time.process_time() - began
+
+
+class _InlineExecutor:
+    """Stands in for the process pool when workers=0 (validation on the dispatching thread)"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def run_pipeline(connect, source, workers=None, chunk_size=CHUNK_SIZE, queue_size=None, is_jsonl=None,
+                 release=None):
+    """
+    Import a CSV/JSONL roster through the reader -> workers -> writer pipeline.
+
+    connect is called on the writer thread to get its SQLite connection (e.g.
+    StudentManager.connect), and release, if given, on the same thread once it is done
+    (e.g. ConnectionPool.release_current, so the pool does not keep it). source is a path or an open text file. workers defaults to
+    the CPU count; 0 validates without a process pool. Returns a PipelineReport.
+    Duplicate roll numbers resolve as in bulk_import: the earliest line wins.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    queue_size = queue_size or max(2, workers * QUEUE_BLOCKS_PER_WORKER)
+    if is_jsonl is None:
+        is_jsonl = isinstance(source, str) and source.lower().endswith((".jsonl", ".ndjson"))
+
+    report = PipelineReport(workers)
+    blocks = queue.Queue(maxsize=queue_size)
+    results = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    failures = []
+
+    def read_stage():
+        stats = report.stages["read"]
+        try:
+            f = open(source, newline='', encoding="utf-8") if isinstance(source, str) else source
+            try:
+                began = time.perf_counter()
+                for block in read_blocks(f, chunk_size, is_jsonl):
+                    stats.busy += time.perf_counter() - began
+                    stats.rows += len(block[2])
+                    if not _put(blocks, block, stop):
+                        return
+                    began = time.perf_counter()
+            finally:
+                if f is not source:
+                    f.close()
+        except BaseException as e:
+            failures.append(e)
+            stop.set()
+        finally:
+            _put(blocks, _DONE, stop)
+
+    def write_stage():
+        validate, write = report.stages["validate"], report.stages["write"]
+        try:
+            conn = connect()
+            known_rolls = existing_rolls(conn)
+            while True:
+                future = _get(results, stop)
+                if future is _DONE or future is None:
+                    return
+                valid, errors, rows, cpu = future.result()
+                validate.rows += rows
+                validate.busy += cpu
+
+                began = time.perf_counter()
+                write.rows += write_validated(conn, valid, errors, known_rolls, report)
+                write.busy += time.perf_counter() - began
+        except BaseException as e:
+            failures.append(e)
+            stop.set()
+        finally:
+            if release:
+                release()
+
+    began = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else _InlineExecutor()
+    reader = threading.Thread(target=read_stage, name="ingest-read", daemon=True)
+    writer = threading.Thread(target=write_stage, name="ingest-write", daemon=True)
+    reader.start()
+    writer.start()
+    try:
+        # Dispatch blocks in file order; results are queued as futures so the writer
+        # consumes them in the same order while the workers run ahead
+        while True:
+            block = _get(blocks, stop)
+            if block is _DONE or block is None:
+                break
+            if not _put(results, executor.submit(parse_and_validate, *block), stop):
+                break
+        _put(results, _DONE, stop)
+        writer.join()
+    finally:
+        if failures:
+            stop.set()
+        executor.shutdown(wait=True, cancel_futures=bool(failures))
+        reader.join()
+        writer.join()
+
+    if failures:
+        raise failures[0]
+
+    report.elapsed = time.perf_counter() - began
+    report.errors.sort()
+    return report
+
+
+def _put(q, item, stop):
+    """Put with backpressure; gives up (returns False) once another stage has failed"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    while True:
+        try:
+            return q.get(timeout=_POLL)
+        except queue.Empty:
+            if stop.is_set():
+                return None
@@ -0,0 +1,364 @@
+# managers/instrumentation.py
+
+import bisect
+import functools
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Statements slower than this get their EXPLAIN QUERY PLAN captured
+SLOW_QUERY_MS = 50.0
+
+# SQLite VM instructions between progress-handler callbacks
+PROGRESS_STEPS = 1000
+
+# Slow queries kept for inspection
+MAX_SLOW_QUERIES = 50
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql):
+    """Replace literals in traced (expanded) SQL with ? so executions of one statement group together"""
+    return " ".join(_LITERAL_RE.sub("?", sql).split())
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (max for the open bucket)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class MethodStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows_returned = 0
+        self.vm_steps = 0
+        self.statements = 0
+        self.failures = 0
+
+
+class Call:
+    """One instrumented method call in progress on the current thread"""
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.statements = []  # [conn, sql, start]
+        self.vm_steps = 0
+        self.rows = None
+        self.failed = False
+
+    def returned(self, result):
+        # (success, msg) results and a failed export's None count as failures;
+        # a single row tuple counts as one row, StudentBatch / list results as their length
+        if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], bool):
+            self.failed = not result[0]
+        elif result is None:
+            self.failed = self.name.startswith("export")
+        elif isinstance(result, tuple):
+            self.rows = 1
+        elif hasattr(result, "__len__") and not isinstance(result, str):
+            self.rows = len(result)
+
+
+class Instrumentation:
+    """
+    Collects timings for StudentManager calls and the SQL they run.
+
+    Methods decorated with @instrumented are timed into per-method histograms. Connections
+    passed to attach() report each statement through sqlite3's trace callback (a statement's
+    time runs until the next statement or the end of the call) and count VM instructions
+    through the progress handler, a rough measure of rows scanned vs rows returned.
+    Statements over slow_query_ms are explained with EXPLAIN QUERY PLAN after the call.
+
+    Sinks receive every finished call and slow query; see LogSink, MemorySink and PrometheusSink.
+    """
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, sinks=()):
+        self.slow_query_ms = slow_query_ms
+        self.sinks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.methods = {}
+        self.statements = {}  # normalized sql -> Histogram
+        self.slow_queries = deque(maxlen=MAX_SLOW_QUERIES)
+        self.slow_query_count = 0
+        for sink in sinks:
+            self.add_sink(sink)
+
+    def add_sink(self, sink):
+        if hasattr(sink, "bind"):
+            sink.bind(self)
+        self.sinks.append(sink)
+
+    # ======== Connection hooks ========
+
+    def attach(self, conn):
+        """Install trace and progress callbacks on a connection"""
+        local = self._local
+
+        def trace(sql):
+            calls = getattr(local, "calls", None)
+            if calls and not getattr(local, "explaining", False):
+                calls[-1].statements.append([conn, sql, time.perf_counter()])
+
+        def progress():
+            calls = getattr(local, "calls", None)
+            if calls:
+                calls[-1].vm_steps += PROGRESS_STEPS
+            return 0
+
+        conn.set_trace_callback(trace)
+        conn.set_progress_handler(progress, PROGRESS_STEPS)
+
+    # ======== Calls ========
+
+    def begin(self, name):
+        call = Call(name)
+        calls = getattr(self._local, "calls", None)
+        if calls is None:
+            calls = self._local.calls = []
+        calls.append(call)
+        return call
+
+    def end(self, call):
+        end = time.perf_counter()
+        self._local.calls.pop()
+        elapsed = (end - call.start) * 1000
+
+        timed = []
+        for index, (conn, sql, start) in enumerate(call.statements):
+            finish = call.statements[index + 1][2] if index + 1 < len(call.statements) else end
+            timed.append((conn, sql, (finish - start) * 1000))
+        slow = [(conn, sql, ms) for conn, sql, ms in timed if ms >= self.slow_query_ms]
+
+        with self._lock:
+            stats = self.methods.get(call.name)
+            if stats is None:
+                stats = self.methods[call.name] = MethodStats()
+            stats.latency.observe(elapsed)
+            stats.rows_returned += call.rows or 0
+            stats.vm_steps += call.vm_steps
+            stats.statements += len(timed)
+            stats.failures += call.failed
+            for _, sql, ms in timed:
+                key = normalize_sql(sql)
+                histogram = self.statements.get(key)
+                if histogram is None:
+                    histogram = self.statements[key] = Histogram()
+                histogram.observe(ms)
+
+        event = {"type": "call", "method": call.name, "ms": elapsed, "rows": call.rows,
+                 "vm_steps": call.vm_steps, "statements": len(timed), "failed": call.failed}
+        self._emit(event)
+
+        for conn, sql, ms in slow:
+            self._record_slow_query(call.name, conn, sql, ms)
+
+    def _record_slow_query(self, method, conn, sql, ms):
+        plan = None
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            self._local.explaining = True
+            try:
+                plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            except Exception as e:
+                plan = [f"(plan unavailable: {e})"]
+            finally:
+                self._local.explaining = False
+
+        entry = {"type": "slow_query", "method": method, "ms": ms, "sql": sql[:1000], "plan": plan,
+                 "time": time.time()}
+        with self._lock:
+            self.slow_queries.append(entry)
+            self.slow_query_count += 1
+        self._emit(entry)
+
+    def _emit(self, event):
+        for sink in self.sinks:
+            try:
+                sink.handle(event)
+            except Exception as e:
+                print(f"Error in instrumentation sink: {e}")
+
+    # ======== Reporting ========
+
+    def snapshot(self):
+        """Plain-dict copy of everything collected so far"""
+        with self._lock:
+            methods = {}
+            for name, stats in self.methods.items():
+                methods[name] = dict(stats.latency.summary(), rows_returned=stats.rows_returned,
+                                     vm_steps=stats.vm_steps, statements=stats.statements,
+                                     failures=stats.failures)
+            statements = {sql: histogram.summary() for sql, histogram in self.statements.items()}
+            return {
+                "methods": methods,
+                "statements": statements,
+                "slow_queries": list(self.slow_queries),
+                "slow_query_count": self.slow_query_count,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.methods.clear()
+            self.statements.clear()
+            self.slow_queries.clear()
+            self.slow_query_count = 0
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format (durations in seconds)"""
+        lines = [
+            "# HELP student_manager_call_seconds StudentManager method latency",
+            "# TYPE student_manager_call_seconds histogram",
+        ]
+        with self._lock:
+            for name, stats in sorted(self.methods.items()):
+                latency = stats.latency
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS + (None,), latency.counts):
+                    cumulative += count
+                    le = "+Inf" if bound is None else repr(bound / 1000)
+                    lines.append(f'student_manager_call_seconds_bucket{{method="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'student_manager_call_seconds_sum{{method="{name}"}} {latency.total / 1000}')
+                lines.append(f'student_manager_call_seconds_count{{method="{name}"}} {latency.count}')
+
+            for metric, attr, help_text in (
+                    ("student_manager_rows_returned_total", "rows_returned", "Rows returned to callers"),
+                    ("student_manager_vm_steps_total", "vm_steps", "SQLite VM instructions executed"),
+                    ("student_manager_statements_total", "statements", "SQL statements executed"),
+                    ("student_manager_failures_total", "failures", "Calls that reported failure")):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in sorted(self.methods.items()):
+                    lines.append(f'{metric}{{method="{name}"}} {getattr(stats, attr)}')
+
+            lines.append("# HELP student_manager_slow_queries_total Statements slower than the slow-query threshold")
+            lines.append("# TYPE student_manager_slow_queries_total counter")
+            lines.append(f"student_manager_slow_queries_total {self.slow_query_count}")
+        return "\n".join(lines) + "\n"
+
+
+def instrumented(method):
+    """Time a StudentManager method when the manager has an Instrumentation attached"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+
+        call = instrumentation.begin(method.__name__)
+        try:
+            result = method(self, *args, **kwargs)
+            call.returned(result)
+            return result
+        except Exception:
+            call.failed = True
+            raise
+        finally:
+            instrumentation.end(call)
+
+    return wrapper
+
+
+# ======== Sinks ========
+
+class LogSink:
+    """Logs slow queries, and calls slower than slow_call_ms, through the logging module"""
+
+    def __init__(self, logger=None, slow_call_ms=SLOW_QUERY_MS):
+        self.logger = logger or logging.getLogger("student_records.instrumentation")
+        self.slow_call_ms = slow_call_ms
+
+    def handle(self, event):
+        if event["type"] == "slow_query":
+            plan = "; ".join(event["plan"] or [])
+            self.logger.warning("slow query in %s (%.1f ms): %s [plan: %s]",
+                                event["method"], event["ms"], event["sql"], plan)
+        elif event["ms"] >= self.slow_call_ms:
+            self.logger.info("%s took %.1f ms (%s rows, %d vm steps, %d statements)",
+                             event["method"], event["ms"], event["rows"], event["vm_steps"], event["statements"])
+
+
+class MemorySink:
+    """Keeps the most recent events in memory, e.g. for a debug view"""
+
+    def __init__(self, max_events=200):
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def handle(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def recent(self, count=None):
+        with self._lock:
+            events = list(self.events)
+        return events[-count:] if count else events
+
+
+class PrometheusSink:
+    """Rewrites a Prometheus text file (for node_exporter's textfile collector) at most every interval seconds"""
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self.instrumentation = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def bind(self, instrumentation):
+        self.instrumentation = instrumentation
+
+    def handle(self, event):
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write()
+
+    def write(self):
+        with self._lock:
+            self._last_write = time.monotonic()
+            # Write then rename so a scraper never reads a half-written file
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.instrumentation.prometheus_text())
+            os.replace(tmp_path, self.path)
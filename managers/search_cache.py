@@ -0,0 +1,79 @@
+# managers/search_cache.py
+
+from collections import OrderedDict
+
+# Number of recent keywords whose results are kept
+MAX_ENTRIES = 32
+
+
+class SearchCache:
+    """
+    LRU cache of keyword -> search results in front of StudentManager.search_students.
+
+    Entries are only valid for the manager's current write_generation; any add, update or
+    delete empties the cache. When a keyword extends a cached substring search
+    (e.g. "smi" -> "smit"), the cached rows are filtered in memory instead of re-querying.
+    """
+
+    def __init__(self, manager, max_entries=MAX_ENTRIES):
+        self.manager = manager
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = manager.write_generation
+        self.hits = 0
+        self.refinements = 0
+        self.misses = 0
+
+    def search(self, keyword):
+        keyword = str(keyword).strip()
+        self._check_generation()
+
+        results = self._entries.get(keyword)
+        if results is not None:
+            self._entries.move_to_end(keyword)
+            self.hits += 1
+            return results
+
+        base = self._refinable_base(keyword)
+        if base is not None:
+            results = self._refine(self._entries[base], keyword)
+            self.refinements += 1
+        else:
+            results = self.manager.search_students(keyword)
+            self.misses += 1
+
+        self._store(keyword, results)
+        return results
+
+    def clear(self):
+        self._entries.clear()
+
+    def _check_generation(self):
+        generation = self.manager.write_generation
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def _refinable_base(self, keyword):
+        """Longest cached keyword that keyword extends, if both are plain substring searches"""
+        if not self.manager.uses_substring_match(keyword):
+            return None
+
+        lowered = keyword.lower()
+        best = None
+        for cached in self._entries:
+            if (len(cached) < len(keyword) and lowered.startswith(cached.lower())
+                    and self.manager.uses_substring_match(cached)
+                    and (best is None or len(cached) > len(best))):
+                best = cached
+        return best
+
+    def _refine(self, rows, keyword):
+        lowered = keyword.lower()
+        return rows.filter(lambda row: lowered in row[1].lower() or keyword in row[2] or keyword in row[3])
+
+    def _store(self, keyword, results):
+        self._entries[keyword] = results
+        self._entries.move_to_end(keyword)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,437 @@
+# managers/sharded_manager.py
+#
+# StudentManager spread over several SQLite files (e.g. one per campus) so campuses do
+# not queue on a single writer lock. Each shard is an ordinary StudentManager database;
+# a small routing database maps every roll number to its shard, which is what keeps
+# roll numbers unique across all of them.
+#
+# Student ids are made globally unique by interleaving: global id = local id * MAX_SHARDS
+# + shard index, so an id alone says which shard holds the row.
+
+import bisect
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from managers.connection_pool import ConnectionPool
+from managers.student_manager import FETCH_SIZE, PAGE_SIZE, StudentManager
+from models.student_batch import StudentBatch
+from utils.db_init import initialize_database
+
+# Upper bound on shards; part of the global id encoding, so it must never change
+MAX_SHARDS = 64
+
+# Chunks each shard may read ahead of the merge when streaming
+PREFETCH_CHUNKS = 2
+
+# Rows moved per transaction by rebalance()
+REBALANCE_BATCH = 500
+
+# Roll numbers per IN (...) lookup, under SQLite's default limit of 999 parameters
+_MAX_PARAMS = 900
+
+_DONE = object()
+
+
+def _name_key(row):
+    return row[1]
+
+
+def _page_key(row):
+    return row[1], row[0]
+
+
+class RangeRouter:
+    """Routes by roll number: ranges is a list of (lowest roll, shard name), any order"""
+
+    def __init__(self, ranges):
+        ranges = sorted((str(low), shard) for low, shard in ranges)
+        self.lows = [low for low, _ in ranges]
+        self.shards = [shard for _, shard in ranges]
+
+    def shard_for(self, roll, campus=None):
+        index = bisect.bisect_right(self.lows, str(roll)) - 1
+        return self.shards[max(index, 0)]
+
+
+class CampusRouter:
+    """Routes by campus key; students without a (known) campus go to the default shard"""
+
+    def __init__(self, campuses, default):
+        self.campuses = dict(campuses)
+        self.default = default
+
+    def shard_for(self, roll, campus=None):
+        return self.campuses.get(campus, self.default)
+
+
+class RoutingIndex:
+    """roll_number -> shard table in its own database; its PRIMARY KEY enforces global uniqueness"""
+
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.pool = ConnectionPool(db_path)
+        conn = self.pool.get()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS roll_routes (
+                    roll_number TEXT PRIMARY KEY,
+                    shard TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+
+    def reserve(self, roll, shard):
+        """Claim roll for shard; returns False if another student already has it"""
+        try:
+            conn = self.pool.get()
+            with conn:
+                conn.execute("INSERT INTO roll_routes (roll_number, shard) VALUES (?, ?)", (roll, shard))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def release(self, roll):
+        conn = self.pool.get()
+        with conn:
+            conn.execute("DELETE FROM roll_routes WHERE roll_number = ?", (roll,))
+
+    def move(self, rolls, shard):
+        conn = self.pool.get()
+        with conn:
+            conn.executemany("UPDATE roll_routes SET shard = ? WHERE roll_number = ?",
+                             [(shard, roll) for roll in rolls])
+
+    def lookup(self, roll):
+        row = self.pool.get().execute("SELECT shard FROM roll_routes WHERE roll_number = ?", (roll,)).fetchone()
+        return row[0] if row else None
+
+    def replace_all(self, routes):
+        """Rebuild the table from (roll, shard) pairs"""
+        conn = self.pool.get()
+        with conn:
+            conn.execute("DELETE FROM roll_routes")
+            conn.executemany("INSERT OR REPLACE INTO roll_routes (roll_number, shard) VALUES (?, ?)", routes)
+
+    def close(self):
+        self.pool.close_all()
+
+
+class ShardedStudentManager:
+    """
+    StudentManager-like API over several shard databases.
+
+    shards maps shard name -> database path (order fixes each shard's index in global ids,
+    so only append new shards). router picks the shard for new students (RangeRouter or
+    CampusRouter). Reads that span shards run on a thread pool, one task per shard, and
+    their name-ordered results are combined with a k-way heapq merge.
+    """
+
+    def __init__(self, shards, router, routing_db="db/routing.db", cache=None):
+        if len(shards) > MAX_SHARDS:
+            raise ValueError(f"At most {MAX_SHARDS} shards are supported")
+        self.names = list(shards)
+        self.router = router
+        self.managers = []
+        for name in self.names:
+            initialize_database(shards[name])
+            self.managers.append(StudentManager(shards[name], cache=cache))
+        self.index_of = {name: index for index, name in enumerate(self.names)}
+        self.routing = RoutingIndex(routing_db)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.names), thread_name_prefix="shard")
+
+    @classmethod
+    def from_config(cls, path):
+        """
+        Build from a JSON file:
+            {"routing": "db/routing.db", "shards": {"north": "db/north.db", ...},
+             "ranges": [["1000000", "north"], ["5000000", "south"]]}
+        or "campuses": {"N": "north", ...} with "default": "north" instead of "ranges".
+        """
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        if "ranges" in config:
+            router = RangeRouter(config["ranges"])
+        else:
+            router = CampusRouter(config["campuses"], config["default"])
+        return cls(config["shards"], router, config.get("routing", "db/routing.db"))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for manager in self.managers:
+            manager.close()
+        self.routing.close()
+
+    # ======== Ids ========
+
+    def _global(self, shard_index, row):
+        return (row[0] * MAX_SHARDS + shard_index,) + tuple(row[1:])
+
+    def _locate(self, student_id):
+        """(shard index, local id) for a global id; shard index is None for unknown shards"""
+        student_id = int(student_id)
+        shard_index = student_id % MAX_SHARDS
+        if shard_index >= len(self.managers):
+            return None, None
+        return shard_index, student_id // MAX_SHARDS
+
+    # ======== Writes ========
+
+    def add_student(self, name, contact, roll, campus=None):
+        shard = self.router.shard_for(roll, campus)
+        if not self.routing.reserve(roll, shard):
+            return False, "Roll number already exists"
+
+        success, msg = self.managers[self.index_of[shard]].add_student(name, contact, roll)
+        if not success:
+            # Give the roll number back; the shard rejected the row
+            self.routing.release(roll)
+        return success, msg
+
+    def update_student(self, student_id, name, contact, roll):
+        shard_index, local_id = self._locate(student_id)
+        if shard_index is None:
+            return False, "Student not found"
+        manager = self.managers[shard_index]
+        current = manager.get_student_by_id(local_id)
+        if current is None:
+            return False, "Student not found"
+
+        # The row stays on its shard even if the router would place the new roll elsewhere;
+        # rebalance() moves it later
+        old_roll = current[3]
+        if roll != old_roll and not self.routing.reserve(roll, self.names[shard_index]):
+            return False, "Roll number already exists for another student"
+
+        success, msg = manager.update_student(local_id, name, contact, roll)
+        if roll != old_roll:
+            self.routing.release(old_roll if success else roll)
+        return success, msg
+
+    def delete_student(self, student_id):
+        shard_index, local_id = self._locate(student_id)
+        if shard_index is None:
+            return False, "Student not found"
+        manager = self.managers[shard_index]
+        current = manager.get_student_by_id(local_id)
+        if current is None:
+            return False, "Student not found"
+
+        success, msg = manager.delete_student(local_id)
+        if success:
+            self.routing.release(current[3])
+        return success, msg
+
+    # ======== Point reads ========
+
+    def get_student_by_id(self, student_id):
+        shard_index, local_id = self._locate(student_id)
+        if shard_index is None:
+            return None
+        row = self.managers[shard_index].get_student_by_id(local_id)
+        return self._global(shard_index, row) if row else None
+
+    def get_student_by_roll(self, roll_number):
+        shard = self.routing.lookup(str(roll_number))
+        if shard not in self.index_of:
+            return None
+        shard_index = self.index_of[shard]
+        row = self.managers[shard_index].get_student_by_roll(roll_number)
+        return self._global(shard_index, row) if row else None
+
+    def validate_unique_roll(self, roll_number, exclude_id=None):
+        if self.routing.lookup(str(roll_number)) is None:
+            return True
+        if exclude_id is None:
+            return False
+        current = self.get_student_by_id(exclude_id)
+        return current is not None and current[3] == str(roll_number)
+
+    # ======== Fan-out reads ========
+
+    def _fan_out(self, fn):
+        """Run fn(shard index, manager) on every shard in parallel; results in shard order"""
+        futures = [self.executor.submit(fn, index, manager) for index, manager in enumerate(self.managers)]
+        return [future.result() for future in futures]
+
+    def count_students(self):
+        return sum(self._fan_out(lambda index, manager: manager.count_students()))
+
+    def search_students(self, keyword):
+        def search(index, manager):
+            return sorted((self._global(index, row) for row in manager.search_students(keyword)), key=_page_key)
+
+        return StudentBatch.from_rows(heapq.merge(*self._fan_out(search), key=_page_key))
+
+    def get_all_students(self):
+        return StudentBatch.from_rows(row for chunk in self.iter_students() for row in chunk)
+
+    def get_students_page(self, after=None, before=None, limit=PAGE_SIZE):
+        """Keyset page over all shards ordered by (name, global id); cursors use global ids"""
+        def page(index, manager):
+            rows = manager.get_students_page(after=self._local_cursor(after, index, after=True),
+                                             before=self._local_cursor(before, index, after=False),
+                                             limit=limit)
+            return [self._global(index, row) for row in rows]
+
+        merged = list(heapq.merge(*self._fan_out(page), key=_page_key))
+        return merged[-limit:] if before is not None else merged[:limit]
+
+    @staticmethod
+    def _local_cursor(cursor, shard_index, after):
+        """
+        Translate a (name, global id) cursor into a (name, local id) cursor for one shard.
+        Global ids of one shard grow with local ids, so the boundary is the largest local id
+        at or below the global id (for `after`) or the smallest at or above it (for `before`).
+        """
+        if cursor is None:
+            return None
+        name, student_id = cursor
+        offset = int(student_id) - shard_index
+        local_id = offset // MAX_SHARDS if after else -(-offset // MAX_SHARDS)
+        return name, local_id
+
+    def iter_students(self, chunk_size=FETCH_SIZE):
+        """
+        Yield StudentBatch chunks ordered by name across all shards. Each shard is read on
+        its own thread, up to PREFETCH_CHUNKS chunks ahead, while this generator merges.
+        Dedicated threads rather than the pool, so other fan-out calls made while a
+        stream is open are never starved of workers.
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=PREFETCH_CHUNKS) for _ in self.managers]
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(index, manager):
+            q = queues[index]
+            try:
+                for chunk in manager.iter_students(chunk_size):
+                    if not put(q, [self._global(index, row) for row in chunk]):
+                        return
+                put(q, _DONE)
+            except Exception as e:
+                put(q, e)
+            finally:
+                # Connections are per thread; this one's is not needed after the stream
+                manager.pool.release_current()
+
+        def rows_from(q):
+            while True:
+                item = q.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield from item
+
+        threads = [threading.Thread(target=produce, args=(index, manager), name=f"shard-stream-{index}", daemon=True)
+                   for index, manager in enumerate(self.managers)]
+        for thread in threads:
+            thread.start()
+        try:
+            batch = StudentBatch()
+            for row in heapq.merge(*(rows_from(q) for q in queues), key=_name_key):
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    yield batch
+                    batch = StudentBatch()
+            if batch:
+                yield batch
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    # ======== Maintenance ========
+
+    def rebuild_routing(self):
+        """Recreate the routing index from the shards' contents; returns the number of rolls"""
+        def rolls(index, manager):
+            return [(roll, self.names[index]) for (roll,) in
+                    manager.connect().execute("SELECT roll_number FROM students")]
+
+        routes = [route for shard_routes in self._fan_out(rolls) for route in shard_routes]
+        self.routing.replace_all(routes)
+        return len(routes)
+
+    def rebalance(self, dry_run=False, batch_size=REBALANCE_BATCH):
+        """
+        Move every student whose roll number the router now assigns to a different shard
+        (e.g. after ranges were changed or a shard was added). Returns (moves, conflicts):
+        moves is {(source, target): count} and conflicts lists (source, target, row) for
+        students left on the source because the target already holds a different student
+        with their roll number (or rejected the row).
+
+        Rows are copied to the target, re-routed, then deleted from the source, a batch at a
+        time. If interrupted, the row may briefly exist in both shards; running rebalance
+        again finishes the move. Moved students get new global ids. Campus routing has no
+        campus stored per student, so only range routing can be rebalanced.
+        """
+        if not isinstance(self.router, RangeRouter):
+            raise ValueError("rebalance needs roll-number range routing")
+
+        moves = {}
+        conflicts = []
+        for source_index, source in enumerate(self.managers):
+            source_name = self.names[source_index]
+            pending = {}
+            for chunk in source.iter_students(batch_size):
+                for row in chunk:
+                    target = self.router.shard_for(row[3])
+                    if target != source_name:
+                        pending.setdefault(target, []).append(row)
+
+            for target, rows in pending.items():
+                if dry_run:
+                    moves[(source_name, target)] = len(rows)
+                    continue
+                moved = 0
+                for start in range(0, len(rows), batch_size):
+                    rejected = self._move_rows(source, self.managers[self.index_of[target]], target,
+                                               rows[start:start + batch_size])
+                    moved += min(batch_size, len(rows) - start) - len(rejected)
+                    conflicts.extend((source_name, target, row) for row in rejected)
+                moves[(source_name, target)] = moved
+        return moves, conflicts
+
+    def _move_rows(self, source, target, target_name, rows):
+        """Move rows from source to target; returns the rows that did not land and stay put"""
+        target_conn = target.connect()
+        with target_conn:
+            # OR IGNORE: rows copied by an interrupted earlier run are already there
+            target_conn.executemany("INSERT OR IGNORE INTO students (name, contact, roll_number) VALUES (?, ?, ?)",
+                                    [row[1:] for row in rows])
+            # Only rows the target now holds verbatim have landed; anything else was ignored
+            # because a different student already has the roll there, or a constraint failed
+            rolls = [row[3] for row in rows]
+            stored = set()
+            for start in range(0, len(rolls), _MAX_PARAMS):
+                part = rolls[start:start + _MAX_PARAMS]
+                stored.update(target_conn.execute(
+                    f"SELECT name, contact, roll_number FROM students WHERE roll_number IN ({', '.join('?' * len(part))})",
+                    part))
+        landed = [row for row in rows if tuple(row[1:]) in stored]
+        rejected = [row for row in rows if tuple(row[1:]) not in stored]
+        if not landed:
+            return rejected
+        self.routing.move([row[3] for row in landed], target_name)
+
+        source_conn = source.connect()
+        with source_conn:
+            source_conn.executemany("DELETE FROM students WHERE id = ?", [(row[0],) for row in landed])
+
+        for manager in (source, target):
+            manager.write_generation += 1
+            if manager.cache:
+                manager.cache.invalidate()
+        return rejected
@@ -0,0 +1,198 @@
+# managers/snapshot.py
+#
+# Read-only binary snapshot of the students table for reporting processes. The file is
+# memory-mapped, so opening it costs a header parse and every process reading the same
+# snapshot shares one copy in the OS page cache. Layout (little-endian, sections 8-byte aligned):
+#
+#   header          MAGIC, version, row count, change_seq, created, section offsets
+#   ids             int64 per row
+#   rolls           ROLL_WIDTH ASCII bytes per row
+#   name offsets    uint32 per row + 1, into the string heap
+#   contact offsets uint32 per row + 1, into the string heap
+#   roll index      uint32 row numbers ordered by roll
+#   string heap     UTF-8 names and contacts
+#
+# Rows are stored ordered by (name, id), so name-prefix search is a binary search over
+# the rows themselves. change_seq is the change-log position the snapshot reflects;
+# StudentManager.changes_since(change_seq) gives what changed after it.
+
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from models.student_batch import StudentBatch
+
+MAGIC = b"STUSNAP1"
+VERSION = 1
+
+# Roll numbers are exactly 7 characters (CHECK constraint on students.roll_number)
+ROLL_WIDTH = 7
+
+# magic, version, flags, rows, change_seq, created, then offsets of ids, rolls,
+# name offsets, contact offsets, roll index and heap, and the heap size
+_HEADER = struct.Struct("<8sIIqqd7Q")
+
+_ALIGN = 8
+
+
+def write_snapshot(path, chunks, change_seq=0):
+    """
+    Write (id, name, contact, roll) rows, which must already be ordered by (name, id),
+    to a snapshot file at path. The file is written next to path and renamed into place,
+    so processes that have the previous snapshot mapped keep reading it undisturbed.
+    Returns the number of rows written.
+    """
+    ids = array("q")
+    rolls = bytearray()
+    name_offsets = array("I", [0])
+    heap = bytearray()
+    contacts = []
+    for chunk in chunks:
+        for student_id, name, contact, roll in chunk:
+            roll = str(roll).encode("ascii")
+            if len(roll) != ROLL_WIDTH:
+                raise ValueError(f"Roll number {roll!r} is not {ROLL_WIDTH} characters")
+            ids.append(student_id)
+            rolls += roll
+            heap += name.encode("utf-8")
+            name_offsets.append(len(heap))
+            contacts.append(contact)
+
+    # Contacts follow all names in the heap; their offsets continue from the names'
+    contact_offsets = array("I", [len(heap)])
+    for contact in contacts:
+        heap += str(contact).encode("utf-8")
+        contact_offsets.append(len(heap))
+    if len(heap) >= 2 ** 32:
+        raise ValueError("String heap exceeds 4 GiB")
+
+    count = len(ids)
+    roll_index = array("I", sorted(range(count), key=lambda row: rolls[row * ROLL_WIDTH:(row + 1) * ROLL_WIDTH]))
+
+    sections = [ids.tobytes(), bytes(rolls), name_offsets.tobytes(), contact_offsets.tobytes(),
+                roll_index.tobytes(), bytes(heap)]
+    offsets = []
+    position = _HEADER.size
+    for data in sections:
+        position = _aligned(position)
+        offsets.append(position)
+        position += len(data)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, count, change_seq, time.time(), *offsets, len(heap)))
+            for offset, data in zip(offsets, sections):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def _aligned(position):
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class Snapshot:
+    """
+    Memory-mapped reader for a snapshot file. Columns are memoryviews over the mapping,
+    so nothing is copied until a row is decoded. Use as a context manager or call close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, _, self.count, self.change_seq, self.created,
+             ids_at, rolls_at, names_at, contacts_at, index_at, heap_at, heap_size) = _HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} student snapshot")
+
+            view = memoryview(self._map)
+            count = self.count
+            self._ids = view[ids_at:ids_at + 8 * count].cast("q")
+            self._rolls = view[rolls_at:rolls_at + ROLL_WIDTH * count]
+            self._name_offsets = view[names_at:names_at + 4 * (count + 1)].cast("I")
+            self._contact_offsets = view[contacts_at:contacts_at + 4 * (count + 1)].cast("I")
+            self._roll_index = view[index_at:index_at + 4 * count].cast("I")
+            self._heap = view[heap_at:heap_at + heap_size]
+            self._views = [view, self._ids, self._rolls, self._name_offsets, self._contact_offsets,
+                           self._roll_index, self._heap]
+        except Exception:
+            self._map.close()
+            raise
+
+    def close(self):
+        # Every exported memoryview must be released before the mapping can close
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    # ======== Rows ========
+
+    def name_bytes(self, row):
+        """UTF-8 name of a row as a memoryview into the mapping (no copy)"""
+        return self._heap[self._name_offsets[row]:self._name_offsets[row + 1]]
+
+    def roll_bytes(self, row):
+        return self._rolls[row * ROLL_WIDTH:(row + 1) * ROLL_WIDTH]
+
+    def row(self, row):
+        """Decode row number `row` into an (id, name, contact, roll) tuple"""
+        heap = self._heap
+        return (self._ids[row],
+                str(heap[self._name_offsets[row]:self._name_offsets[row + 1]], "utf-8"),
+                str(heap[self._contact_offsets[row]:self._contact_offsets[row + 1]], "utf-8"),
+                str(self.roll_bytes(row), "ascii"))
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self.row(row)
+
+    def iter_batches(self, chunk_size=1000):
+        """Yield StudentBatch chunks in (name, id) order, e.g. for exporter.write_chunks"""
+        for start in range(0, self.count, chunk_size):
+            yield StudentBatch.from_rows(self.row(row) for row in range(start, min(start + chunk_size, self.count)))
+
+    # ======== Lookups ========
+
+    def get_by_roll(self, roll):
+        """The row with this roll number, or None; a binary search over the roll index"""
+        target = str(roll).encode("ascii", "replace")
+        index = self._roll_index
+        position = bisect.bisect_left(index, target, key=lambda row: self.roll_bytes(row).tobytes())
+        if position < len(index) and self.roll_bytes(index[position]) == target:
+            return self.row(index[position])
+        return None
+
+    def name_range(self, prefix):
+        """(first, end) row numbers of the names starting with prefix (case-sensitive)"""
+        target = prefix.encode("utf-8")
+        rows = range(self.count)
+        first = bisect.bisect_left(rows, target, key=lambda row: self.name_bytes(row).tobytes())
+        end = bisect.bisect_right(rows, target, lo=first,
+                                  key=lambda row: self.name_bytes(row)[:len(target)].tobytes())
+        return first, end
+
+    def search_prefix(self, prefix):
+        """Rows whose name starts with prefix, in (name, id) order"""
+        first, end = self.name_range(prefix)
+        return StudentBatch.from_rows(self.row(row) for row in range(first, end))
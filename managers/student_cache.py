@@ -0,0 +1,156 @@
+# managers/student_cache.py
+
+import bisect
+import threading
+from models.student_batch import StudentBatch
+
+# Largest table the cache will hold in full; bigger tables only cache id lookups
+DEFAULT_MAX_ROWS = 200000
+
+
+class StudentCache:
+    """
+    Read-through / write-through cache of student rows for StudentManager.
+
+    Holds id -> row and roll -> id dicts plus a (name, id) list kept sorted with bisect,
+    so full listings, pages and roll checks can be answered without SQL. If the table
+    has more than max_rows rows only individual id lookups are cached (oldest evicted first).
+
+    Changes committed by other connections are detected with PRAGMA data_version;
+    any such change empties the cache.
+    """
+
+    def __init__(self, max_rows=DEFAULT_MAX_ROWS):
+        self.max_rows = max_rows
+        self._lock = threading.RLock()
+        self._versions = {}
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _reset(self):
+        self.by_id = {}
+        self.roll_to_id = {}
+        self.order = []
+        self.complete = False
+
+    # ======== Invalidation ========
+
+    def sync(self, conn):
+        """Drop cached data if another connection has committed since we last looked"""
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._lock:
+            previous = self._versions.get(id(conn))
+            self._versions[id(conn)] = version
+            # A connection we have not seen before cannot tell us what changed before it opened
+            if previous != version and (self.by_id or self.complete):
+                self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._reset()
+            self.invalidations += 1
+
+    # ======== Reads ========
+
+    def load_all(self, rows):
+        """Fill the cache after a full listing had to be read from the database"""
+        with self._lock:
+            self.misses += 1
+            if len(rows) > self.max_rows:
+                return
+            self._reset()
+            for row in rows:
+                self.by_id[row[0]] = row
+                self.roll_to_id[row[3]] = row[0]
+            self.order = sorted((row[1], row[0]) for row in rows)
+            self.complete = True
+
+    def all_rows(self):
+        with self._lock:
+            self.hits += 1
+            return StudentBatch.from_rows(self.by_id[student_id] for _, student_id in self.order)
+
+    def page(self, after=None, before=None, limit=None):
+        """Keyset page over the cached (name, id) order; only valid when complete"""
+        with self._lock:
+            self.hits += 1
+            if before is not None:
+                end = bisect.bisect_left(self.order, tuple(before))
+                keys = self.order[max(0, end - limit):end]
+            else:
+                start = bisect.bisect_right(self.order, tuple(after)) if after is not None else 0
+                keys = self.order[start:start + limit]
+            return [self.by_id[student_id] for _, student_id in keys]
+
+    def get(self, student_id):
+        """Return (found, row); found is True when the cache can answer authoritatively"""
+        with self._lock:
+            row = self.by_id.get(student_id)
+            if row is not None or self.complete:
+                self.hits += 1
+                return True, row
+            self.misses += 1
+            return False, None
+
+    def get_by_roll(self, roll_number):
+        with self._lock:
+            if not self.complete:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            student_id = self.roll_to_id.get(roll_number)
+            return True, self.by_id.get(student_id)
+
+    def roll_taken(self, roll_number, exclude_id=None):
+        """True/False when known, None if the cache cannot answer"""
+        with self._lock:
+            if not self.complete:
+                self.misses += 1
+                return None
+            self.hits += 1
+            owner = self.roll_to_id.get(roll_number)
+            return owner is not None and owner != exclude_id
+
+    # ======== Writes ========
+
+    def put(self, row):
+        """Write-through for an inserted or updated row"""
+        with self._lock:
+            self._discard(row[0])
+            self.by_id[row[0]] = row
+            if self.complete:
+                self.roll_to_id[row[3]] = row[0]
+                bisect.insort(self.order, (row[1], row[0]))
+                if len(self.by_id) > self.max_rows:
+                    self._reset()
+            elif len(self.by_id) > self.max_rows:
+                # Partial mode: evict the oldest cached lookup
+                del self.by_id[next(iter(self.by_id))]
+
+    def remove(self, student_id):
+        with self._lock:
+            self._discard(student_id)
+
+    def _discard(self, student_id):
+        row = self.by_id.pop(student_id, None)
+        if row is None or not self.complete:
+            return
+        if self.roll_to_id.get(row[3]) == student_id:
+            del self.roll_to_id[row[3]]
+        index = bisect.bisect_left(self.order, (row[1], row[0]))
+        if index < len(self.order) and self.order[index] == (row[1], row[0]):
+            del self.order[index]
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "rows": len(self.by_id),
+                "complete": self.complete,
+            }
@@ -1,192 +1,618 @@
 # managers/student_manager.py
 
 import sqlite3
-import csv
 from models.student import Student
+from models.student_batch import StudentBatch
+from utils.helpers import normalize_uk_phone, validate_roll_number, validate_uk_phone
+from utils.db_init import rebuild_student_stats
+from managers.connection_pool import ConnectionPool
+from managers.bulk_import import BATCH_SIZE, import_records, read_records, upsert_records
+from managers.exporter import FORMATS, detect_format, open_output, write_chunks
+from managers.student_cache import StudentCache
+from managers.instrumentation import instrumented
+from managers.ingest import CHUNK_SIZE, run_pipeline
+from managers.dedup import DedupEngine
+from managers.group_commit import MAX_BATCH, MAX_LATENCY_MS, GroupCommitQueue
+from managers.snapshot import write_snapshot
+
+# Rows fetched per round-trip when streaming the table
+FETCH_SIZE = 1000
+
+# Default number of rows per keyset page
+PAGE_SIZE = 200
+
+# Most change-log entries read by one changes_since call
+CHANGE_BATCH = 1000
+
+
+def _is_roll_conflict(error):
+    return "UNIQUE" in str(error) and "roll_number" in str(error)
+
+
+def _parse_student_id(student_id):
+    """student_id as an int, or None if it cannot be one (no such student)"""
+    try:
+        return int(student_id)
+    except (TypeError, ValueError):
+        return None
+
 
 class StudentManager:
-    def __init__(self, db_path="db/database.db"):
+    def __init__(self, db_path="db/database.db", pool=None, cache=None, instrumentation=None, dedup=None,
+                 durability=None, max_batch=MAX_BATCH, max_latency_ms=MAX_LATENCY_MS):
         self.db_path = db_path
+        self.pool = pool or ConnectionPool(db_path)
+
+        # Optional Instrumentation: times decorated methods and traces SQL on pooled connections
+        self.instrumentation = instrumentation
+        if instrumentation and self.pool.on_connect is None:
+            self.pool.on_connect = instrumentation.attach
+
+        # Optional StudentCache; pass cache=True for one with default bounds
+        self.cache = StudentCache() if cache is True else cache or None
+        self._search_index = None
+
+        # Optional DedupEngine; pass dedup=True for one with default thresholds
+        self.dedup = DedupEngine(self) if dedup is True else dedup or None
+
+        # Bumped after every successful write so caches can tell their data is stale
+        self.write_generation = 0
+
+        # Optional group commit for add/update/delete: durability "full", "grouped" or
+        # "relaxed" (see managers/group_commit.py); None commits each write directly
+        self.writes = None
+        if durability:
+            self.writes = GroupCommitQueue(self.pool, durability, max_batch=max_batch, max_latency_ms=max_latency_ms)
 
     def connect(self):
-        return sqlite3.connect(self.db_path)
+        """Return this thread's pooled connection (do not close it)"""
+        return self.pool.get()
+
+    def close(self):
+        """Close all pooled connections; call on shutdown"""
+        if self.writes:
+            self.writes.close()
+        self.pool.close_all()
 
-    def add_student(self, name, contact, roll):
+    def _cached(self):
+        """Return the cache once it has been checked against external writes, or None"""
+        if self.cache is None:
+            return None
+        self.cache.sync(self.connect())
+        return self.cache
+
+    def cache_metrics(self):
+        """Hit/miss counters of the student cache (empty dict when caching is off)"""
+        return self.cache.metrics() if self.cache else {}
+
+    @instrumented
+    def add_student(self, name, contact, roll, allow_duplicate=True):
+        """
+        Insert one student. With allow_duplicate=False and a dedup engine, a student who
+        looks like someone already on file is not added and the message names the match.
+        """
         try:
             # Ensure contact is stored as string with leading zero
             contact = self._normalize_phone_number(contact)
-            
+
+            if not allow_duplicate and self.dedup:
+                matches = self.dedup.find_matches(name, contact)
+                if matches:
+                    _, match = matches[0]
+                    return False, f"Possible duplicate of {match[1]} (roll {match[3]}, contact {match[2]})"
+
             student = Student(name, contact, roll)
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            # Check if roll number already exists
-            cursor.execute("SELECT id FROM students WHERE roll_number = ?", (roll,))
-            if cursor.fetchone():
-                conn.close()
-                return False, "Roll number already exists"
-            
-            cursor.execute("INSERT INTO students (name, contact, roll_number) VALUES (?, ?, ?)",
-                           student.to_db_tuple())
-            conn.commit()
-            conn.close()
-            return True, "Student added successfully"
-        except sqlite3.IntegrityError:
-            return False, "Roll number must be unique"
+            return self._write(self._insert_row, *student.to_db_tuple())
         except Exception as e:
             return False, f"Database error: {str(e)}"
 
+    @instrumented
     def update_student(self, student_id, name, contact, roll):
         try:
             # Ensure contact is stored as string with leading zero
             contact = self._normalize_phone_number(contact)
-            
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            # Check if roll number exists for a different student
-            cursor.execute("SELECT id FROM students WHERE roll_number = ? AND id != ?", (roll, student_id))
-            if cursor.fetchone():
-                conn.close()
-                return False, "Roll number already exists for another student"
-            
-            cursor.execute("""
+            student_id = _parse_student_id(student_id)
+            if student_id is None:
+                return False, "Student not found"
+            return self._write(self._update_row, student_id, name, contact, roll)
+        except Exception as e:
+            return False, f"Database error: {str(e)}"
+
+    def _write(self, op, *args):
+        """
+        Run a single-row write: through the group-commit queue when one is configured,
+        otherwise in its own transaction. op(conn, *args) returns (success, msg, after_commit).
+        """
+        if self.writes:
+            return self.writes.submit(op, *args)
+        conn = self.connect()
+        with conn:
+            success, msg, after_commit = op(conn, *args)
+        if after_commit:
+            after_commit()
+        return success, msg
+
+    def _committed(self, row=None, removed_id=None):
+        """after_commit callback: bump write_generation and patch the cache"""
+        def apply():
+            self.write_generation += 1
+            if self.cache:
+                if row:
+                    self.cache.put(row)
+                else:
+                    self.cache.remove(removed_id)
+        return apply
+
+    def _insert_row(self, conn, name, contact, roll):
+        try:
+            # The UNIQUE constraint on roll_number rejects duplicates; no pre-check needed
+            cursor = conn.execute("INSERT INTO students (name, contact, roll_number) VALUES (?, ?, ?)",
+                                  (name, contact, roll))
+        except sqlite3.IntegrityError as e:
+            if _is_roll_conflict(e):
+                return False, "Roll number already exists", None
+            return False, f"Invalid student data: {e}", None
+        return True, "Student added successfully", self._committed((cursor.lastrowid, name, contact, roll))
+
+    def _update_row(self, conn, student_id, name, contact, roll):
+        try:
+            cursor = conn.execute("""
                 UPDATE students SET name = ?, contact = ?, roll_number = ?
                 WHERE id = ?
             """, (name, contact, roll, student_id))
-            
-            if cursor.rowcount == 0:
-                conn.close()
-                return False, "Student not found"
-                
-            conn.commit()
-            conn.close()
-            return True, "Student updated successfully"
+        except sqlite3.IntegrityError as e:
+            if _is_roll_conflict(e):
+                return False, "Roll number already exists for another student", None
+            return False, f"Invalid student data: {e}", None
+        if cursor.rowcount == 0:
+            return False, "Student not found", None
+        return True, "Student updated successfully", self._committed((student_id, name, contact, roll))
+
+    def _delete_row(self, conn, student_id):
+        cursor = conn.execute("DELETE FROM students WHERE id = ?", (student_id,))
+        if cursor.rowcount == 0:
+            return False, "Student not found", None
+        return True, "Student deleted successfully", self._committed(removed_id=student_id)
+
+    @instrumented
+    def upsert_students(self, records):
+        """
+        Insert or update many students keyed on roll number in a single transaction.
+        records are (name, contact, roll_number) tuples or dicts; returns one
+        (outcome, detail) pair per record (see bulk_import.upsert_records).
+        """
+        try:
+            outcomes = upsert_records(self.connect(), records)
         except Exception as e:
-            return False, f"Database error: {str(e)}"
+            print(f"Error upserting students: {e}")
+            return None
+
+        if any(outcome in ("inserted", "updated") for outcome, _ in outcomes):
+            self.write_generation += 1
+            if self.cache:
+                self.cache.invalidate()
+        return outcomes
 
+    @instrumented
     def delete_student(self, student_id):
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
-            
-            if cursor.rowcount == 0:
-                conn.close()
+            student_id = _parse_student_id(student_id)
+            if student_id is None:
                 return False, "Student not found"
-                
-            conn.commit()
-            conn.close()
-            return True, "Student deleted successfully"
+            return self._write(self._delete_row, student_id)
         except Exception as e:
             return False, f"Database error: {str(e)}"
 
+    @instrumented
     def get_all_students(self):
         try:
+            cache = self._cached()
+            if cache and cache.complete:
+                return cache.all_rows()
+
             conn = self.connect()
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM students ORDER BY name")
             rows = cursor.fetchall()
-            conn.close()
-            
+
             # Ensure phone numbers are properly formatted
-            formatted_rows = []
+            formatted_rows = StudentBatch()
             for row in rows:
                 student_id, name, contact, roll = row
                 contact = self._normalize_phone_number(str(contact))
                 formatted_rows.append((student_id, name, contact, roll))
-            
+
+            if cache:
+                cache.load_all(formatted_rows)
             return formatted_rows
         except Exception as e:
             print(f"Error fetching students: {e}")
+            return StudentBatch()
+
+    @instrumented
+    def get_students_page(self, after=None, before=None, limit=PAGE_SIZE):
+        """
+        Return up to `limit` students ordered by (name, id) using keyset pagination.
+        `after` / `before` are (name, id) cursors taken from the last / first row of a page.
+        """
+        try:
+            cache = self._cached()
+            if cache and cache.complete:
+                return cache.page(after=after, before=before, limit=limit)
+
+            cursor = self.connect().cursor()
+            if before is not None:
+                cursor.execute("""
+                    SELECT * FROM students WHERE (name, id) < (?, ?)
+                    ORDER BY name DESC, id DESC LIMIT ?
+                """, (before[0], before[1], limit))
+                rows = cursor.fetchall()[::-1]
+            elif after is not None:
+                cursor.execute("""
+                    SELECT * FROM students WHERE (name, id) > (?, ?)
+                    ORDER BY name, id LIMIT ?
+                """, (after[0], after[1], limit))
+                rows = cursor.fetchall()
+            else:
+                cursor.execute("SELECT * FROM students ORDER BY name, id LIMIT ?", (limit,))
+                rows = cursor.fetchall()
+
+            return [(student_id, name, self._normalize_phone_number(str(contact)), roll)
+                    for student_id, name, contact, roll in rows]
+        except Exception as e:
+            print(f"Error fetching page of students: {e}")
             return []
 
+    @instrumented
     def search_students(self, keyword):
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM students
-                WHERE name LIKE ? OR contact LIKE ? OR roll_number LIKE ?
-                ORDER BY name
-            """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-            rows = cursor.fetchall()
-            conn.close()
-            
+            keyword = str(keyword).strip()
+            cursor = self.connect().cursor()
+
+            rows = []
+            # Full roll numbers and phone numbers are answered straight from their indexes
+            if validate_roll_number(keyword):
+                cursor.execute("SELECT * FROM students WHERE roll_number = ?", (keyword,))
+                rows = cursor.fetchall()
+            elif validate_uk_phone(keyword):
+                cursor.execute("SELECT * FROM students WHERE contact = ? ORDER BY name",
+                               (self._normalize_phone_number(keyword),))
+                rows = cursor.fetchall()
+
+            if not rows:
+                cursor.execute(*self._search_query(keyword))
+                rows = cursor.fetchall()
+
             # Ensure phone numbers are properly formatted
-            formatted_rows = []
+            formatted_rows = StudentBatch()
             for row in rows:
                 student_id, name, contact, roll = row
                 contact = self._normalize_phone_number(str(contact))
                 formatted_rows.append((student_id, name, contact, roll))
-            
+
             return formatted_rows
         except Exception as e:
             print(f"Error searching students: {e}")
-            return []
+            return StudentBatch()
+
+    def uses_substring_match(self, keyword):
+        """True if search_students(keyword) returns every row containing keyword"""
+        keyword = str(keyword).strip()
+        return (len(keyword) >= 3
+                and not validate_roll_number(keyword)
+                and not validate_uk_phone(keyword))
+
+    def _search_query(self, keyword):
+        """Build the (sql, params) used for a free-text search"""
+        if not keyword:
+            return "SELECT * FROM students ORDER BY name", ()
+
+        if len(keyword) < 3:
+            # Too short for the trigram index: match by prefix using the column indexes
+            if keyword.isdigit():
+                return ("SELECT * FROM students WHERE roll_number GLOB ? OR contact GLOB ? ORDER BY name",
+                        (keyword + "*", keyword + "*"))
+            pattern = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            return "SELECT * FROM students WHERE name LIKE ? ESCAPE '\\' ORDER BY name", (pattern,)
+
+        if self._has_search_index():
+            # Quoted trigram phrase = case-insensitive substring match on any column
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            return ("""
+                SELECT s.* FROM students_fts f JOIN students s ON s.id = f.rowid
+                WHERE students_fts MATCH ?
+                ORDER BY s.name
+            """, (phrase,))
+
+        return ("""
+            SELECT * FROM students
+            WHERE name LIKE ? OR contact LIKE ? OR roll_number LIKE ?
+            ORDER BY name
+        """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
+
+    def _has_search_index(self):
+        if self._search_index is None:
+            cursor = self.connect().execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'")
+            self._search_index = cursor.fetchone() is not None
+        return self._search_index
+
+    def iter_students(self, chunk_size=FETCH_SIZE):
+        """Yield StudentBatch chunks of formatted rows, ordered by name, using fetchmany"""
+        cursor = self.connect().cursor()
+        cursor.execute("SELECT * FROM students ORDER BY name")
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield StudentBatch.from_rows(
+                    (student_id, name, self._normalize_phone_number(str(contact)), roll)
+                    for student_id, name, contact, roll in rows)
+        finally:
+            cursor.close()
+
+    @instrumented
+    def count_students(self):
+        """Return the number of students in the table"""
+        try:
+            return self.connect().execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        except Exception as e:
+            print(f"Error counting students: {e}")
+            return 0
+
+    @instrumented
+    def stats(self):
+        """
+        Student counts from the trigger-maintained student_stats table:
+        {"total": n, "roll_prefix": {...}, "phone_type": {...}, "initial": {...}}.
+        Reads a few dozen rows whatever the table size.
+        """
+        try:
+            result = {"total": 0}
+            rows = self.connect().execute(
+                "SELECT dimension, bucket, count FROM student_stats WHERE count > 0 ORDER BY dimension, bucket")
+            for dimension, bucket, count in rows:
+                if dimension == "total":
+                    result["total"] = count
+                else:
+                    result.setdefault(dimension, {})[bucket] = count
+            return result
+        except Exception as e:
+            print(f"Error reading statistics: {e}")
+            return {"total": 0}
 
-    def export_to_csv(self, filepath):
+    def rebuild_stats(self):
+        """Recount student_stats from scratch (e.g. after editing the database by hand)"""
+        conn = self.connect()
+        with conn:
+            rebuild_student_stats(conn.cursor())
+        return self.stats()
+
+    @instrumented
+    def export_students(self, filepath, fmt=None, columns=None, predicate=None,
+                        progress=None, chunk_size=FETCH_SIZE):
+        """
+        Stream the students table to filepath as csv, jsonl or columnar (gzip if it ends in .gz).
+        Returns the number of rows written, or None if the export failed.
+        """
         try:
-            students = self.get_all_students()
-            with open(filepath, "w", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Name", "Contact", "Roll Number"])
-                writer.writerows(students)
-            return True
+            fmt = fmt or detect_format(filepath)
+            if fmt not in FORMATS:
+                raise ValueError(f"Unsupported export format: {fmt}")
+            total = self.count_students() if progress else None
+            with open_output(filepath) as f:
+                return write_chunks(f, self.iter_students(chunk_size), fmt=fmt, columns=columns,
+                                    predicate=predicate, progress=progress, total=total)
         except Exception as e:
             print(f"Export error: {e}")
-            return False
+            return None
+
+    @instrumented
+    def export_to_csv(self, filepath, progress=None):
+        return self.export_students(filepath, fmt="csv", progress=progress) is not None
+
+    @instrumented
+    def export_snapshot(self, filepath, chunk_size=FETCH_SIZE):
+        """
+        Write a memory-mapped snapshot (see managers/snapshot.py) for read-only consumers.
+        The snapshot records the change-log position it reflects, so readers can catch up
+        with changes_since(). Returns the number of rows written, or None on failure.
+        """
+        conn = self.connect()
+        try:
+            # One read transaction so the rows and change_seq describe the same moment
+            conn.execute("BEGIN")
+            change_seq = self.latest_change_seq()
+            cursor = conn.execute("SELECT * FROM students ORDER BY name, id")
+
+            def chunks():
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield [(student_id, name, self._normalize_phone_number(str(contact)), roll)
+                           for student_id, name, contact, roll in rows]
+
+            return write_snapshot(filepath, chunks(), change_seq)
+        except Exception as e:
+            print(f"Snapshot error: {e}")
+            return None
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    @instrumented
+    def bulk_import(self, filepath, batch_size=BATCH_SIZE, jobs=1):
+        """
+        Import a CSV/JSONL roster in batched transactions; returns an ImportReport.
+        filepath may also be an iterable of (line number, record) pairs, e.g. from iter_records(sys.stdin).
+        """
+        records = read_records(filepath) if isinstance(filepath, str) else filepath
+        report = import_records(self.connect(), records, batch_size=batch_size, jobs=jobs)
+        if report.imported:
+            self.write_generation += 1
+            if self.cache:
+                self.cache.invalidate()
+        return report
+
+    @instrumented
+    def ingest(self, source, workers=None, chunk_size=CHUNK_SIZE, is_jsonl=None):
+        """
+        Import a very large roster through the parallel reader -> worker processes -> writer
+        pipeline (managers/ingest.py); returns a PipelineReport with per-stage throughput.
+        """
+        report = run_pipeline(self.connect, source, workers=workers, chunk_size=chunk_size, is_jsonl=is_jsonl,
+                              release=self.pool.release_current)
+        if report.imported:
+            self.write_generation += 1
+            if self.cache:
+                self.cache.invalidate()
+        return report
+
+    @instrumented
+    def changes_since(self, seq, limit=CHANGE_BATCH):
+        """
+        Return (next_seq, changes) for change-log entries after seq, oldest first.
 
+        changes holds one (seq, op, student_id, row) per changed student, where row is the
+        student's current formatted row or None if it has been deleted. Pass next_seq to the
+        following call. changes is None when entries after seq have been pruned: the caller
+        has to reload in full and continue from latest_change_seq(). At most limit entries
+        are read per call; if the log cannot be read, no changes are returned.
+        """
+        try:
+            conn = self.connect()
+            # One read transaction so the bounds check and the entries see the same snapshot
+            owns_transaction = not conn.in_transaction
+            if owns_transaction:
+                conn.execute("BEGIN")
+            try:
+                oldest, newest = conn.execute("""
+                    SELECT (SELECT MIN(seq) FROM student_changes),
+                           (SELECT seq FROM sqlite_sequence WHERE name = 'student_changes')
+                """).fetchone()
+                newest = newest or 0
+                # Entries after seq were pruned, or seq comes from a different (e.g. restored) database
+                if seq > newest or (oldest or newest + 1) > seq + 1:
+                    return seq, None
+
+                rows = conn.execute("""
+                    SELECT c.seq, c.op, c.student_id, s.name, s.contact, s.roll_number
+                    FROM student_changes c LEFT JOIN students s ON s.id = c.student_id
+                    WHERE c.seq > ? ORDER BY c.seq LIMIT ?
+                """, (seq, limit)).fetchall()
+            finally:
+                if owns_transaction:
+                    conn.rollback()
+        except Exception as e:
+            print(f"Error reading changes: {e}")
+            return seq, []
+
+        # Several entries for the same student collapse into its latest one
+        latest = {}
+        for change_seq, op, student_id, name, contact, roll in rows:
+            row = None
+            if name is not None:
+                row = (student_id, name, self._normalize_phone_number(str(contact)), roll)
+            latest.pop(student_id, None)
+            latest[student_id] = (change_seq, op, student_id, row)
+        return (rows[-1][0] if rows else seq), list(latest.values())
+
+    def latest_change_seq(self):
+        """Sequence number of the newest change-log entry (0 if nothing has changed yet)"""
+        row = self.connect().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'student_changes'").fetchone()
+        return row[0] if row else 0
+
+    def prune_changes(self, before_seq):
+        """Delete change-log entries older than before_seq; returns the number removed"""
+        conn = self.connect()
+        with conn:
+            return conn.execute("DELETE FROM student_changes WHERE seq < ?", (before_seq,)).rowcount
+
+    @instrumented
+    def find_duplicates(self, name, contact, exclude_id=None):
+        """(score, row) pairs for students who are probably the same person, best first"""
+        try:
+            engine = self.dedup or DedupEngine(self)
+            return engine.find_matches(name, self._normalize_phone_number(contact), exclude_id)
+        except Exception as e:
+            print(f"Error checking for duplicates: {e}")
+            return []
+
+    @instrumented
     def get_student_by_id(self, student_id):
         """Get a single student by ID"""
         try:
+            cache = self._cached()
+            if cache:
+                found, row = cache.get(int(student_id))
+                if found:
+                    return row
+
             conn = self.connect()
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM students WHERE id = ?", (student_id,))
             row = cursor.fetchone()
-            conn.close()
-            
+
             if row:
                 student_id, name, contact, roll = row
                 contact = self._normalize_phone_number(str(contact))
+                if cache:
+                    cache.put((student_id, name, contact, roll))
                 return (student_id, name, contact, roll)
             return None
         except Exception as e:
             print(f"Error fetching student: {e}")
             return None
 
+    @instrumented
+    def get_student_by_roll(self, roll_number):
+        """Get a single student by roll number"""
+        try:
+            cache = self._cached()
+            if cache:
+                found, row = cache.get_by_roll(str(roll_number))
+                if found:
+                    return row
+
+            cursor = self.connect().cursor()
+            cursor.execute("SELECT * FROM students WHERE roll_number = ?", (roll_number,))
+            row = cursor.fetchone()
+
+            if row:
+                student_id, name, contact, roll = row
+                return (student_id, name, self._normalize_phone_number(str(contact)), roll)
+            return None
+        except Exception as e:
+            print(f"Error fetching student: {e}")
+            return None
+
     def _normalize_phone_number(self, phone):
         """Ensure phone number starts with 0 and is properly formatted"""
-        phone = str(phone).strip()
-        
-        # Remove any non-digit characters except leading +
-        if phone.startswith('+44'):
-            # Convert +44 format to UK format
-            phone = phone.replace('+44', '0', 1)
-            phone = ''.join(filter(str.isdigit, phone))
-        else:
-            phone = ''.join(filter(str.isdigit, phone))
-        
-        # Ensure it starts with 0 if it's a UK number
-        if phone and not phone.startswith('0') and len(phone) in [10, 11]:
-            phone = '0' + phone
-        
-        return phone
+        return normalize_uk_phone(phone)
 
+    @instrumented
     def validate_unique_roll(self, roll_number, exclude_id=None):
         """Check if roll number is unique"""
         try:
+            cache = self._cached()
+            if cache:
+                taken = cache.roll_taken(str(roll_number), int(exclude_id) if exclude_id else None)
+                if taken is not None:
+                    return not taken
+
             conn = self.connect()
             cursor = conn.cursor()
-            
+
             if exclude_id:
-                cursor.execute("SELECT id FROM students WHERE roll_number = ? AND id != ?", 
+                cursor.execute("SELECT id FROM students WHERE roll_number = ? AND id != ?",
                              (roll_number, exclude_id))
             else:
                 cursor.execute("SELECT id FROM students WHERE roll_number = ?", (roll_number,))
-            
+
             result = cursor.fetchone()
-            conn.close()
             return result is None
         except Exception as e:
             print(f"Error validating roll number: {e}")
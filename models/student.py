@@ -1,11 +1,27 @@
 # models/student.py
 
 class Student:
+    """Immutable student record; __slots__ keeps each instance small"""
+
+    __slots__ = ("_id", "_name", "_contact", "_roll_number")
+
     def __init__(self, name, contact, roll_number, student_id=None):
-        self._id = student_id
-        self._name = name
-        self._contact = contact
-        self._roll_number = roll_number
+        object.__setattr__(self, "_id", student_id)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_contact", contact)
+        object.__setattr__(self, "_roll_number", roll_number)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a Student from an (id, name, contact, roll_number) row"""
+        student_id, name, contact, roll_number = row
+        return cls(name, contact, roll_number, student_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Student records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Student records are immutable")
 
     @property
     def id(self):
@@ -28,3 +44,27 @@ class Student:
 
     def to_db_tuple(self):
         return (self._name, self._contact, self._roll_number)
+
+    # Behave like the (id, name, contact, roll_number) row tuples used elsewhere
+    def __iter__(self):
+        return iter(self.to_tuple())
+
+    def __getitem__(self, index):
+        return self.to_tuple()[index]
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        if isinstance(other, Student):
+            return self.to_tuple() == other.to_tuple()
+        if isinstance(other, tuple):
+            return self.to_tuple() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.to_tuple())
+
+    def __repr__(self):
+        return (f"Student(name={self._name!r}, contact={self._contact!r}, "
+                f"roll_number={self._roll_number!r}, student_id={self._id!r})")
@@ -0,0 +1,83 @@
+# models/student_batch.py
+
+import sys
+from array import array
+from models.student import Student
+
+
+class StudentBatch:
+    """
+    Columnar container for many students: ids in an array('q') and one list per text
+    column. Names repeat a lot across a roster, so they are interned and shared.
+
+    Iterating, indexing and len() behave like a list of (id, name, contact, roll_number)
+    tuples, so a batch can be used wherever the manager used to return such a list.
+    """
+
+    __slots__ = ("ids", "names", "contacts", "rolls")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.names = []
+        self.contacts = []
+        self.rolls = []
+
+    @classmethod
+    def from_rows(cls, rows):
+        batch = cls()
+        batch.extend(rows)
+        return batch
+
+    def append(self, row):
+        student_id, name, contact, roll = row
+        self.ids.append(student_id)
+        self.names.append(sys.intern(name))
+        self.contacts.append(contact)
+        self.rolls.append(roll)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __bool__(self):
+        return len(self.ids) > 0
+
+    def __iter__(self):
+        return zip(self.ids, self.names, self.contacts, self.rolls)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = StudentBatch()
+            batch.ids = self.ids[index]
+            batch.names = self.names[index]
+            batch.contacts = self.contacts[index]
+            batch.rolls = self.rolls[index]
+            return batch
+        return (self.ids[index], self.names[index], self.contacts[index], self.rolls[index])
+
+    def __eq__(self, other):
+        if isinstance(other, (StudentBatch, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<StudentBatch of {len(self)} student(s)>"
+
+    def column(self, name):
+        """Return one column ('id', 'name', 'contact' or 'roll_number') without copying"""
+        return {"id": self.ids, "name": self.names, "contact": self.contacts, "roll_number": self.rolls}[name]
+
+    def filter(self, predicate):
+        """New batch holding the rows for which predicate(row) is true"""
+        return StudentBatch.from_rows(row for row in self if predicate(row))
+
+    def student(self, index):
+        return Student.from_row(self[index])
+
+    def students(self):
+        """Yield Student objects (creates one object per row; prefer iterating tuples)"""
+        for row in self:
+            yield Student.from_row(row)
@@ -0,0 +1,8 @@
+# student_records/__main__.py
+#
+# Headless entry point:  python -m student_records --help
+
+import sys
+from student_records.cli import main
+
+sys.exit(main())
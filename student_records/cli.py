@@ -0,0 +1,367 @@
+# student_records/cli.py
+#
+# Command-line access to StudentManager for scripts and nightly jobs (no Tk display needed).
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from managers.bulk_import import BATCH_SIZE, iter_records
+from managers.dedup import MATCH_THRESHOLD, DedupEngine
+from managers.exporter import FORMATS, write_chunks
+from managers.group_commit import DURABILITY
+from managers.ingest import CHUNK_SIZE
+from managers.student_manager import StudentManager
+from utils.backup import BACKUP_DIR
+from utils.db_init import SCHEMA_VERSION, initialize_database
+from utils.helpers import format_uk_phone, validate_roll_number, validate_student_name, validate_uk_phone
+
+DEFAULT_DB = "db/database.db"
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="student_records", description="Student records command-line tools")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database path (default {DEFAULT_DB})")
+    parser.add_argument("--json", action="store_true", help="machine-readable JSON output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add one student")
+    add.add_argument("name")
+    add.add_argument("contact")
+    add.add_argument("roll")
+
+    search = commands.add_parser("search", help="search by name, contact or roll number")
+    search.add_argument("keyword")
+
+    export = commands.add_parser("export", help="export all students")
+    export.add_argument("path", nargs="?", default="-", help="output file, '-' for stdout (default)")
+    export.add_argument("--format", choices=FORMATS, help="defaults to the file extension, csv for stdout")
+    export.add_argument("--columns", nargs="+", help="columns to export (id name contact roll_number)")
+
+    snapshot = commands.add_parser("snapshot", help="write a memory-mapped read-only snapshot for reporting jobs")
+    snapshot.add_argument("path")
+
+    imp = commands.add_parser("import", help="bulk import a CSV/JSONL roster")
+    imp.add_argument("path", nargs="?", default="-", help="input file, '-' for stdin (default)")
+    imp.add_argument("--format", choices=("csv", "jsonl"), help="stdin format (default csv)")
+    imp.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per transaction")
+    imp.add_argument("--jobs", type=int, default=1, help="worker processes used for validation")
+
+    ingest = commands.add_parser("ingest", help="import a very large roster with parallel validation")
+    ingest.add_argument("path", nargs="?", default="-", help="input file, '-' for stdin (default)")
+    ingest.add_argument("--format", choices=("csv", "jsonl"), help="defaults to the file extension, csv for stdin")
+    ingest.add_argument("--workers", type=int, help="validation processes (default: CPU count)")
+    ingest.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per block")
+
+    duplicates = commands.add_parser("duplicates", help="find students probably entered more than once")
+    duplicates.add_argument("--workers", type=int, default=1, help="worker processes used for scoring")
+    duplicates.add_argument("--threshold", type=float, default=MATCH_THRESHOLD, help=f"minimum score (default {MATCH_THRESHOLD})")
+
+    changes = commands.add_parser("changes", help="print the change feed after a sequence number")
+    changes.add_argument("--since", type=int, default=0, help="last sequence number already seen (default 0)")
+    changes.add_argument("--prune-before", type=int, help="instead, delete log entries older than this sequence number")
+
+    stats = commands.add_parser("stats", help="table statistics and breakdowns")
+    stats.add_argument("--rebuild", action="store_true", help="recount the summary tables first")
+
+    backup = commands.add_parser("backup", help="online backup of the database")
+    backup.add_argument("--dir", default=BACKUP_DIR, help=f"backup directory (default {BACKUP_DIR})")
+    backup.add_argument("--incremental", action="store_true", help="store only pages changed since the last backup")
+    backup.add_argument("--no-compress", action="store_true", help="write uncompressed files")
+    backup.add_argument("--keep", type=positive_int, help="then delete all but this many full backups (at least 1)")
+
+    backups = commands.add_parser("backups", help="list backups")
+    backups.add_argument("--dir", default=BACKUP_DIR)
+
+    verify = commands.add_parser("verify", help="rebuild a backup and run an integrity check")
+    verify.add_argument("backup", help="backup name or file")
+    verify.add_argument("--dir", default=BACKUP_DIR)
+
+    restore = commands.add_parser("restore", help="replace the database with a backup")
+    restore.add_argument("backup", help="backup name or file")
+    restore.add_argument("--dir", default=BACKUP_DIR)
+
+    rebalance = commands.add_parser("rebalance", help="move students between shard databases to match the routing config")
+    rebalance.add_argument("config", help="shard config JSON (see ShardedStudentManager.from_config)")
+    rebalance.add_argument("--dry-run", action="store_true", help="only report how many students would move")
+    rebalance.add_argument("--rebuild-routing", action="store_true", help="first rebuild the roll -> shard index from the shards")
+
+    serve = commands.add_parser("serve", help="run the local HTTP/JSON API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--read-workers", type=int, default=4, help="threads serving read requests")
+    serve.add_argument("--durability", choices=tuple(DURABILITY),
+                       help="group-commit writes with this durability (default: commit each write)")
+    return parser
+
+
+def cmd_add(manager, args):
+    name, contact, roll = args.name.strip(), format_uk_phone(args.contact.strip()), args.roll.strip()
+    if not validate_student_name(name):
+        success, msg = False, "Invalid name"
+    elif not validate_uk_phone(contact):
+        success, msg = False, "Invalid UK phone number"
+    elif not validate_roll_number(roll):
+        success, msg = False, "Roll number must be exactly 7 digits"
+    else:
+        success, msg = manager.add_student(name, contact, roll)
+
+    emit(args, {"success": success, "message": msg}, msg)
+    return 0 if success else 1
+
+
+def cmd_search(manager, args):
+    results = manager.search_students(args.keyword)
+    out = sys.stdout
+    for student_id, name, contact, roll in results:
+        if args.json:
+            out.write(json.dumps({"id": student_id, "name": name, "contact": contact, "roll_number": roll}) + "\n")
+        else:
+            out.write(f"{student_id}\t{name}\t{contact}\t{roll}\n")
+    return 0
+
+
+def cmd_export(manager, args):
+    if args.path == "-":
+        written = write_chunks(sys.stdout, manager.iter_students(), fmt=args.format or "csv",
+                               columns=args.columns)
+    else:
+        written = manager.export_students(args.path, fmt=args.format, columns=args.columns)
+        if written is None:
+            emit(args, {"success": False}, "Export failed", stream=sys.stderr)
+            return 1
+        emit(args, {"success": True, "written": written}, f"Exported {written} student(s) to {args.path}")
+    return 0
+
+
+def cmd_snapshot(manager, args):
+    written = manager.export_snapshot(args.path)
+    if written is None:
+        emit(args, {"success": False}, "Snapshot failed", stream=sys.stderr)
+        return 1
+    emit(args, {"success": True, "written": written}, f"Wrote snapshot of {written} student(s) to {args.path}")
+    return 0
+
+
+def cmd_import(manager, args):
+    if args.path == "-":
+        source = iter_records(sys.stdin, is_jsonl=args.format == "jsonl")
+    else:
+        source = args.path
+    report = manager.bulk_import(source, batch_size=args.batch_size, jobs=args.jobs)
+
+    if args.json:
+        print(json.dumps({
+            "imported": report.imported,
+            "rejected": report.failed,
+            "errors": [{"line": line_no, "message": message} for line_no, message in report.errors],
+        }))
+    else:
+        for line_no, message in report.errors:
+            print(f"line {line_no}: {message}", file=sys.stderr)
+        print(report.summary())
+    return 0 if report.imported or not report.failed else 1
+
+
+def cmd_ingest(manager, args):
+    source = sys.stdin if args.path == "-" else args.path
+    is_jsonl = args.format == "jsonl" if args.format else None
+    report = manager.ingest(source, workers=args.workers, chunk_size=args.chunk_size, is_jsonl=is_jsonl)
+
+    if args.json:
+        print(json.dumps({
+            "imported": report.imported,
+            "rejected": report.failed,
+            "throughput": report.throughput(),
+            "errors": [{"line": line_no, "message": message} for line_no, message in report.errors],
+        }))
+    else:
+        for line_no, message in report.errors:
+            print(f"line {line_no}: {message}", file=sys.stderr)
+        print(report.summary())
+        print(report.throughput_summary())
+    return 0 if report.imported or not report.failed else 1
+
+
+def cmd_duplicates(manager, args):
+    pairs = DedupEngine(manager, threshold=args.threshold).find_all(workers=args.workers)
+    for value, id_a, id_b in pairs:
+        a, b = manager.get_student_by_id(id_a), manager.get_student_by_id(id_b)
+        if not a or not b:
+            continue
+        if args.json:
+            print(json.dumps({"score": value, "students": [
+                {"id": row[0], "name": row[1], "contact": row[2], "roll_number": row[3]} for row in (a, b)]}))
+        else:
+            print(f"{value:.3f}\t" + "\t".join(f"{row[0]} {row[1]} {row[2]} {row[3]}" for row in (a, b)))
+    return 0
+
+
+def cmd_changes(manager, args):
+    if args.prune_before is not None:
+        removed = manager.prune_changes(args.prune_before)
+        emit(args, {"removed": removed}, f"Removed {removed} change log entries")
+        return 0
+
+    seq = args.since
+    while True:
+        seq, changes = manager.changes_since(seq)
+        if changes is None:
+            latest = manager.latest_change_seq()
+            emit(args, {"error": "pruned", "latest": latest},
+                 f"Change log no longer reaches back that far; export in full and continue from {latest}",
+                 stream=sys.stderr)
+            return 1
+        if not changes:
+            return 0
+        for change_seq, op, student_id, row in changes:
+            if args.json:
+                student = None
+                if row:
+                    student = {"id": row[0], "name": row[1], "contact": row[2], "roll_number": row[3]}
+                print(json.dumps({"seq": change_seq, "op": op, "id": student_id, "student": student}))
+            else:
+                print("\t".join(map(str, (change_seq, op, student_id, *(row[1:] if row else ())))))
+
+
+def cmd_stats(manager, args):
+    breakdown = manager.rebuild_stats() if args.rebuild else manager.stats()
+    stats = {
+        "students": breakdown.pop("total"),
+        "schema_version": SCHEMA_VERSION,
+        "database_bytes": os.path.getsize(manager.db_path),
+    }
+    lines = [f"{key}: {value}" for key, value in stats.items()]
+    for dimension, buckets in breakdown.items():
+        lines.append(f"{dimension}: " + ", ".join(f"{bucket}={count}" for bucket, count in buckets.items()))
+    stats.update(breakdown)
+    emit(args, stats, "\n".join(lines))
+    return 0
+
+
+def cmd_backup(manager, args):
+    from utils.backup import apply_retention, create_backup
+
+    manifest = create_backup(args.db, args.dir, compress=not args.no_compress, incremental=args.incremental)
+    removed = apply_retention(args.dir, args.keep, source=args.db) if args.keep is not None else []
+    data = {"name": manifest["name"], "kind": manifest["kind"], "file": os.path.join(args.dir, manifest["file"]),
+            "pages": manifest.get("changed_pages", manifest["page_count"]), "removed": removed}
+    text = f"{manifest['kind'].capitalize()} backup written to {data['file']} ({data['pages']} page(s))"
+    if removed:
+        text += f"; removed {len(removed)} old backup(s)"
+    emit(args, data, text)
+    return 0
+
+
+def cmd_backups(manager, args):
+    from utils.backup import list_backups
+
+    for manifest in list_backups(args.dir):
+        size = os.path.getsize(os.path.join(args.dir, manifest["file"]))
+        if args.json:
+            print(json.dumps({"name": manifest["name"], "kind": manifest["kind"], "parent": manifest["parent"],
+                              "created": manifest["created"], "bytes": size}))
+        else:
+            print(f"{manifest['name']}\t{manifest['kind']}\t{size}")
+    return 0
+
+
+def cmd_verify(manager, args):
+    from utils.backup import verify_backup
+
+    ok, message = verify_backup(args.backup, args.dir)
+    emit(args, {"ok": ok, "message": message}, f"{args.backup}: {message}")
+    return 0 if ok else 1
+
+
+def cmd_restore(manager, args):
+    import sqlite3
+    from utils.backup import BackupError, restore_backup
+
+    manager.close()
+    try:
+        manifest = restore_backup(args.backup, args.db, args.dir)
+    except (BackupError, OSError, sqlite3.Error) as e:
+        emit(args, {"success": False, "message": str(e)}, str(e), stream=sys.stderr)
+        return 1
+    emit(args, {"success": True, "name": manifest["name"]}, f"Restored {args.db} from {manifest['name']}")
+    return 0
+
+
+def cmd_rebalance(manager, args):
+    from managers.sharded_manager import ShardedStudentManager
+
+    with contextlib.redirect_stdout(sys.stderr):
+        sharded = ShardedStudentManager.from_config(args.config)
+    try:
+        if args.rebuild_routing:
+            print(f"Routing index rebuilt with {sharded.rebuild_routing()} roll number(s)", file=sys.stderr)
+        moves, conflicts = sharded.rebalance(dry_run=args.dry_run)
+    finally:
+        sharded.close()
+
+    verb = "would move" if args.dry_run else "moved"
+    data = [{"from": source, "to": target, "students": count,
+             "conflicts": [row[3] for s, t, row in conflicts if (s, t) == (source, target)]}
+            for (source, target), count in moves.items()]
+    lines = [f"{source} -> {target}: {verb} {count} student(s)" for (source, target), count in moves.items()]
+    lines += [f"{source} -> {target}: roll {row[3]} ({row[1]}) already taken on {target}; left on {source}"
+              for source, target, row in conflicts]
+    emit(args, data, "\n".join(lines) or "All students are on their shard")
+    return 1 if conflicts else 0
+
+
+def cmd_serve(manager, args):
+    # asyncio and the HTTP plumbing are only needed for this command
+    from student_records.server import serve
+
+    serve(args.db, args.host, args.port, args.read_workers, args.durability)
+    return 0
+
+
+def emit(args, data, text, stream=None):
+    print(json.dumps(data) if args.json else text, file=stream or sys.stdout)
+
+
+COMMANDS = {
+    "add": cmd_add,
+    "search": cmd_search,
+    "export": cmd_export,
+    "snapshot": cmd_snapshot,
+    "import": cmd_import,
+    "ingest": cmd_ingest,
+    "duplicates": cmd_duplicates,
+    "changes": cmd_changes,
+    "stats": cmd_stats,
+    "serve": cmd_serve,
+    "rebalance": cmd_rebalance,
+    "backup": cmd_backup,
+    "backups": cmd_backups,
+    "verify": cmd_verify,
+    "restore": cmd_restore,
+}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Keep stdout clean for piped output; migration messages go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        initialize_database(args.db)
+
+    manager = StudentManager(args.db)
+    try:
+        return COMMANDS[args.command](manager, args)
+    except BrokenPipeError:
+        # e.g. piping search or export output into `head`
+        return 0
+    finally:
+        manager.close()
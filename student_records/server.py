@@ -0,0 +1,395 @@
+# student_records/server.py
+#
+# Local HTTP/JSON API over StudentManager.
+# Run from the project root:  python -m student_records serve --port 8080
+#
+#   GET    /students?after_name=&after_id=&limit=   keyset-paginated listing
+#   GET    /students/<id>
+#   POST   /students            {"name", "contact", "roll_number"}
+#   PUT    /students/<id>       {"name", "contact", "roll_number"}
+#   DELETE /students/<id>
+#   GET    /search?q=<keyword>
+#   GET    /export?format=csv|jsonl                streamed with chunked encoding
+#   GET    /changes?since=<seq>&limit=             change feed; 410 when since is too old
+#   GET    /stats                                  counts per roll prefix, phone type and initial
+
+import asyncio
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from managers.student_manager import CHANGE_BATCH, PAGE_SIZE, StudentManager
+from utils.helpers import format_uk_phone, validate_roll_number, validate_student_name, validate_uk_phone
+
+DEFAULT_READ_WORKERS = 4
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 64 * 1024
+
+# Threads that may block on the group-commit queue at once (when a durability mode is set)
+GROUP_WRITE_WAITERS = 64
+
+# Export chunks buffered between the reader thread and the socket
+EXPORT_QUEUE_SIZE = 4
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 410: "Gone", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def student_json(row):
+    student_id, name, contact, roll = row
+    return {"id": student_id, "name": name, "contact": contact, "roll_number": roll}
+
+
+class StudentAPIServer:
+    """
+    asyncio HTTP server. Reads run on a bounded thread pool (each thread keeps its own
+    pooled connection); all writes go through a single writer thread, so SQLite never
+    sees competing writers from this process.
+
+    With a durability mode the manager's group-commit queue is that single writer, and
+    up to GROUP_WRITE_WAITERS requests wait on it at once so their writes share commits.
+    """
+
+    def __init__(self, db_path="db/database.db", host="127.0.0.1", port=8080,
+                 read_workers=DEFAULT_READ_WORKERS, max_pending=256, durability=None):
+        self.host = host
+        self.port = port
+        self.manager = StudentManager(db_path, durability=durability)
+        self.readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="api-read")
+        self.writer = ThreadPoolExecutor(max_workers=GROUP_WRITE_WAITERS if durability else 1,
+                                         thread_name_prefix="api-write")
+        self.max_pending = max_pending
+        self._pending = None
+        self._server = None
+        self._connections = {}  # handler task -> stream writer
+
+    # ======== Lifecycle ========
+
+    async def start(self):
+        self._pending = asyncio.Semaphore(self.max_pending)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving student records on http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+        # Closing the transports makes idle keep-alive handlers see EOF and return
+        for writer in self._connections.values():
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server:
+            await self._server.wait_closed()
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+        self.manager.close()
+
+    # ======== Database dispatch ========
+
+    async def _read(self, fn, *args):
+        return await self._run(self.readers, fn, *args)
+
+    async def _write(self, fn, *args):
+        return await self._run(self.writer, fn, *args)
+
+    async def _run(self, executor, fn, *args):
+        # Bound the work queued behind the thread pools so overload shows up as latency
+        # at the socket rather than as unbounded memory
+        async with self._pending:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    # ======== HTTP plumbing ========
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    # The body cannot be delimited, so answer and close the connection
+                    await self._send_json(writer, e.status, {"error": e.message})
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    await self._dispatch(method, target, body, writer)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": e.message})
+                except ConnectionError:
+                    # Client gone, or a streamed response failed after its head was sent
+                    raise
+                except Exception as e:
+                    await self._send_json(writer, 500, {"error": f"Server error: {e}"})
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _send(self, writer, status, body, content_type):
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_json(self, writer, status, data):
+        await self._send(writer, status, json.dumps(data).encode("utf-8"), "application/json")
+
+    # ======== Routes ========
+
+    async def _dispatch(self, method, target, body, writer):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["students"]:
+            if method == "GET":
+                return await self._list_students(writer, query)
+            if method == "POST":
+                return await self._add_student(writer, body)
+        elif len(parts) == 2 and parts[0] == "students":
+            student_id = self._parse_id(parts[1])
+            if method == "GET":
+                return await self._get_student(writer, student_id)
+            if method == "PUT":
+                return await self._update_student(writer, student_id, body)
+            if method == "DELETE":
+                return await self._delete_student(writer, student_id)
+        elif parts == ["search"] and method == "GET":
+            return await self._search(writer, query)
+        elif parts == ["export"] and method == "GET":
+            return await self._export(writer, query)
+        elif parts == ["changes"] and method == "GET":
+            return await self._changes(writer, query)
+        elif parts == ["stats"] and method == "GET":
+            return await self._send_json(writer, 200, await self._read(self.manager.stats))
+        else:
+            raise HTTPError(404, "Unknown endpoint")
+        raise HTTPError(405, "Method not allowed")
+
+    async def _list_students(self, writer, query):
+        try:
+            limit = min(int(query.get("limit", PAGE_SIZE)), MAX_PAGE_SIZE)
+            after = (query["after_name"], int(query["after_id"])) if "after_name" in query else None
+        except (KeyError, ValueError):
+            raise HTTPError(400, "Invalid paging parameters")
+
+        rows = await self._read(lambda: self.manager.get_students_page(after=after, limit=limit))
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = {"after_name": rows[-1][1], "after_id": rows[-1][0]}
+        await self._send_json(writer, 200, {"students": [student_json(r) for r in rows], "next": next_cursor})
+
+    async def _get_student(self, writer, student_id):
+        row = await self._read(self.manager.get_student_by_id, student_id)
+        if row is None:
+            raise HTTPError(404, "Student not found")
+        await self._send_json(writer, 200, student_json(row))
+
+    async def _add_student(self, writer, body):
+        name, contact, roll = self._parse_student(body)
+        success, msg = await self._write(self.manager.add_student, name, contact, roll)
+        if not success:
+            raise HTTPError(self._status_for(msg), msg)
+        row = await self._read(self.manager.get_student_by_roll, roll)
+        await self._send_json(writer, 201, student_json(row))
+
+    async def _update_student(self, writer, student_id, body):
+        name, contact, roll = self._parse_student(body)
+        success, msg = await self._write(self.manager.update_student, student_id, name, contact, roll)
+        if not success:
+            raise HTTPError(self._status_for(msg), msg)
+        row = await self._read(self.manager.get_student_by_id, student_id)
+        await self._send_json(writer, 200, student_json(row))
+
+    async def _delete_student(self, writer, student_id):
+        success, msg = await self._write(self.manager.delete_student, student_id)
+        if not success:
+            raise HTTPError(self._status_for(msg), msg)
+        await self._send_json(writer, 200, {"message": msg})
+
+    async def _search(self, writer, query):
+        keyword = query.get("q", "")
+        try:
+            limit = min(int(query.get("limit", MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+        except ValueError:
+            raise HTTPError(400, "Invalid limit")
+        rows = await self._read(self.manager.search_students, keyword)
+        await self._send_json(writer, 200, {"total": len(rows), "students": [student_json(r) for r in rows[:limit]]})
+
+    async def _changes(self, writer, query):
+        try:
+            since = int(query.get("since", 0))
+            limit = min(int(query.get("limit", CHANGE_BATCH)), CHANGE_BATCH)
+        except ValueError:
+            raise HTTPError(400, "Invalid since or limit")
+        next_seq, changes = await self._read(self.manager.changes_since, since, limit)
+        if changes is None:
+            raise HTTPError(410, "Change log no longer reaches back to since; reload in full")
+        await self._send_json(writer, 200, {"next": next_seq, "changes": [
+            {"seq": seq, "op": op, "id": student_id, "student": student_json(row) if row else None}
+            for seq, op, student_id, row in changes]})
+
+    async def _export(self, writer, query):
+        fmt = query.get("format", "csv")
+        if fmt not in ("csv", "jsonl"):
+            raise HTTPError(400, "format must be csv or jsonl")
+
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=EXPORT_QUEUE_SIZE)
+
+        def produce():
+            # The cursor lives on this one reader thread for the whole export;
+            # put() blocks here when the client reads slower than we fetch
+            try:
+                for batch in self.manager.iter_students():
+                    asyncio.run_coroutine_threadsafe(chunks.put(self._encode(batch, fmt)), loop).result()
+            finally:
+                asyncio.run_coroutine_threadsafe(chunks.put(None), loop).result()
+
+        content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                      f"Transfer-Encoding: chunked\r\n\r\n").encode("latin-1"))
+        if fmt == "csv":
+            self._write_chunk(writer, b"ID,Name,Contact,Roll Number\r\n")
+
+        producer = loop.run_in_executor(self.readers, produce)
+        try:
+            try:
+                while True:
+                    data = await chunks.get()
+                    if data is None:
+                        break
+                    self._write_chunk(writer, data)
+                    await writer.drain()
+            finally:
+                # Unblock the producer if the client went away mid-stream
+                while not producer.done():
+                    try:
+                        chunks.get_nowait()
+                    except asyncio.QueueEmpty:
+                        await asyncio.sleep(0.01)
+            await producer
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # The 200 head is already out, so an error response would corrupt the chunked
+            # body; drop the connection instead and let the client see a truncated transfer
+            raise ConnectionError(f"export failed mid-stream: {e}") from e
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # ======== Helpers ========
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        if data:
+            writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+
+    @staticmethod
+    def _encode(batch, fmt):
+        if fmt == "jsonl":
+            return "".join(json.dumps(student_json(row)) + "\n" for row in batch).encode("utf-8")
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        return buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _parse_id(text):
+        try:
+            return int(text)
+        except ValueError:
+            raise HTTPError(404, "Student not found")
+
+    @staticmethod
+    def _parse_student(body):
+        try:
+            data = json.loads(body or b"{}")
+            name = str(data.get("name", "")).strip()
+            contact = format_uk_phone(str(data.get("contact", "")).strip())
+            roll = str(data.get("roll_number", "")).strip()
+        except (ValueError, AttributeError):
+            raise HTTPError(400, "Body must be a JSON object")
+
+        if not validate_student_name(name):
+            raise HTTPError(400, "Invalid name")
+        if not validate_uk_phone(contact):
+            raise HTTPError(400, "Invalid UK phone number")
+        if not validate_roll_number(roll):
+            raise HTTPError(400, "Roll number must be exactly 7 digits")
+        return name, contact, roll
+
+    @staticmethod
+    def _status_for(msg):
+        if "not found" in msg:
+            return 404
+        if "Roll number" in msg:
+            return 409
+        if msg.startswith("Invalid"):
+            return 400
+        return 500
+
+
+def serve(db_path="db/database.db", host="127.0.0.1", port=8080, read_workers=DEFAULT_READ_WORKERS,
+          durability=None):
+    server = StudentAPIServer(db_path, host, port, read_workers, durability=durability)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.readers.shutdown(wait=False)
+        server.writer.shutdown(wait=False)
+        server.manager.close()
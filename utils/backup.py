@@ -0,0 +1,312 @@
+# utils/backup.py
+#
+# Online backups through the SQLite backup API. A snapshot is either a full copy of the
+# database or an incremental file holding only the pages that changed since the previous
+# snapshot; every snapshot has a JSON manifest next to it with per-page hashes, so the
+# next incremental can be computed without re-reading older backups.
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+BACKUP_DIR = "db/backups"
+
+# Pages copied per backup step, and the pause between steps so writers are not starved
+PAGES_PER_STEP = 256
+STEP_PAUSE = 0.005
+
+# Full snapshots kept by apply_retention (each with the incrementals built on it)
+KEEP_FULL = 7
+
+# An incremental chain is restarted with a full snapshot after this many links
+MAX_CHAIN = 24
+
+_PAGE_NUMBER_BYTES = 4
+
+
+class BackupError(Exception):
+    pass
+
+
+def create_backup(db_path="db/database.db", backup_dir=BACKUP_DIR, compress=True, incremental=False,
+                  pages_per_step=PAGES_PER_STEP, pause=STEP_PAUSE, progress=None):
+    """
+    Snapshot db_path into backup_dir and return the manifest dict of the new snapshot.
+
+    The copy is taken with Connection.backup, pages_per_step pages at a time with a short
+    pause between steps, so it is consistent even while the app is writing. With
+    incremental=True only pages that differ from the latest snapshot are stored (a full
+    snapshot is taken when there is nothing to build on). progress(remaining, total) is
+    called after each step.
+    """
+    if not os.path.exists(db_path):
+        raise BackupError(f"Database not found: {db_path}")
+    os.makedirs(backup_dir, exist_ok=True)
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    stem = f"{os.path.splitext(os.path.basename(db_path))[0]}_{stamp}"
+
+    with tempfile.TemporaryDirectory(dir=backup_dir) as tmp:
+        copy_path = os.path.join(tmp, "copy.db")
+        _online_copy(db_path, copy_path, pages_per_step, pause, progress, standalone=True)
+
+        ok, message = check_integrity(copy_path)
+        if not ok:
+            raise BackupError(f"Backup copy failed integrity check: {message}")
+
+        page_size = _page_size(copy_path)
+        hashes = _page_hashes(copy_path, page_size)
+
+        # Only this database's snapshots can be a parent; backup_dir may be shared
+        parent = latest_backup(backup_dir, source=db_path) if incremental else None
+        if parent and (parent["page_size"] != page_size or parent.get("chain", 0) >= MAX_CHAIN):
+            parent = None
+
+        manifest = {
+            "kind": "incremental" if parent else "full",
+            "source": os.path.abspath(db_path),
+            "created": time.time(),
+            "parent": parent["name"] if parent else None,
+            "chain": parent.get("chain", 0) + 1 if parent else 0,
+            "page_size": page_size,
+            "page_count": len(hashes),
+            "compressed": compress,
+            "hashes": hashes,
+        }
+
+        if parent:
+            changed = [index for index, digest in enumerate(hashes)
+                       if index >= len(parent["hashes"]) or parent["hashes"][index] != digest]
+            data_name = f"{stem}.pages" + (".gz" if compress else "")
+            _write_pages(copy_path, os.path.join(tmp, data_name), page_size, changed, compress)
+            manifest["changed_pages"] = len(changed)
+        else:
+            data_name = f"{stem}.db" + (".gz" if compress else "")
+            _write_full(copy_path, os.path.join(tmp, data_name), compress)
+
+        manifest["name"] = stem
+        manifest["file"] = data_name
+
+        # Publish the data file before its manifest so a listed snapshot is always complete
+        os.replace(os.path.join(tmp, data_name), os.path.join(backup_dir, data_name))
+        manifest_tmp = os.path.join(tmp, f"{stem}.json")
+        with open(manifest_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_tmp, os.path.join(backup_dir, f"{stem}.json"))
+
+    return manifest
+
+
+def list_backups(backup_dir=BACKUP_DIR, source=None):
+    """Manifests of all snapshots in backup_dir, oldest first; only those of database source if given"""
+    if not os.path.isdir(backup_dir):
+        return []
+    source = os.path.abspath(source) if source else None
+    manifests = []
+    for entry in os.listdir(backup_dir):
+        if entry.endswith(".json"):
+            try:
+                with open(os.path.join(backup_dir, entry), encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if source is None or manifest.get("source") == source:
+                manifests.append(manifest)
+    manifests.sort(key=lambda m: m["created"])
+    return manifests
+
+
+def latest_backup(backup_dir=BACKUP_DIR, source=None):
+    backups = list_backups(backup_dir, source)
+    return backups[-1] if backups else None
+
+
+def find_backup(name_or_path, backup_dir=BACKUP_DIR):
+    """Resolve a snapshot given its name, manifest path or data file path"""
+    base = os.path.basename(name_or_path)
+    for suffix in (".json", ".gz", ".db", ".pages"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    if os.path.dirname(name_or_path):
+        backup_dir = os.path.dirname(name_or_path)
+    for manifest in list_backups(backup_dir):
+        if manifest["name"] == base:
+            return manifest, backup_dir
+    raise BackupError(f"Backup not found: {name_or_path}")
+
+
+def materialize(manifest, backup_dir, out_path):
+    """Rebuild the database image of a snapshot (applying its incremental chain) at out_path"""
+    chain = [manifest]
+    by_name = {m["name"]: m for m in list_backups(backup_dir)}
+    while chain[-1]["parent"]:
+        parent = by_name.get(chain[-1]["parent"])
+        if parent is None:
+            raise BackupError(f"Missing parent snapshot {chain[-1]['parent']}")
+        chain.append(parent)
+    chain.reverse()
+
+    _read_full(os.path.join(backup_dir, chain[0]["file"]), out_path, chain[0]["compressed"])
+    with open(out_path, "r+b") as out:
+        for link in chain[1:]:
+            _apply_pages(os.path.join(backup_dir, link["file"]), out, link["page_size"], link["compressed"])
+        out.truncate(manifest["page_count"] * manifest["page_size"])
+    return out_path
+
+
+def verify_backup(name_or_path, backup_dir=BACKUP_DIR):
+    """Rebuild a snapshot in a temporary file and run PRAGMA integrity_check; returns (ok, message)"""
+    try:
+        manifest, backup_dir = find_backup(name_or_path, backup_dir)
+        with tempfile.TemporaryDirectory() as tmp:
+            image = materialize(manifest, backup_dir, os.path.join(tmp, "verify.db"))
+            hashes = _page_hashes(image, manifest["page_size"])
+            if hashes != manifest["hashes"]:
+                return False, "Page hashes do not match the manifest"
+            return check_integrity(image)
+    except (BackupError, OSError, sqlite3.Error) as e:
+        return False, str(e)
+
+
+def restore_backup(name_or_path, db_path="db/database.db", backup_dir=BACKUP_DIR,
+                   pages_per_step=PAGES_PER_STEP, pause=STEP_PAUSE):
+    """
+    Replace the contents of db_path with a snapshot. The snapshot is rebuilt and checked
+    first, then copied in with the backup API so open connections see a consistent database.
+    """
+    manifest, backup_dir = find_backup(name_or_path, backup_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        image = materialize(manifest, backup_dir, os.path.join(tmp, "restore.db"))
+        ok, message = check_integrity(image)
+        if not ok:
+            raise BackupError(f"Snapshot {manifest['name']} failed integrity check: {message}")
+        _online_copy(image, db_path, pages_per_step, pause)
+    return manifest
+
+
+def apply_retention(backup_dir=BACKUP_DIR, keep_full=KEEP_FULL, source=None):
+    """
+    Delete all but the newest keep_full full snapshots and their incrementals; returns removed
+    names. With source, only that database's snapshots are counted and deleted. keep_full
+    must be at least 1, so the newest full snapshot and its chain always survive.
+    """
+    if keep_full < 1:
+        raise ValueError("keep_full must be at least 1")
+    backups = list_backups(backup_dir, source)
+    fulls = [m for m in backups if m["kind"] == "full"]
+    if len(fulls) <= keep_full:
+        return []
+
+    # Everything created before the oldest full snapshot we keep belongs to an expired chain
+    cutoff = fulls[-keep_full]["created"]
+    removed = []
+    for manifest in backups:
+        if manifest["created"] < cutoff:
+            for name in (manifest["file"], f"{manifest['name']}.json"):
+                path = os.path.join(backup_dir, name)
+                if os.path.exists(path):
+                    os.remove(path)
+            removed.append(manifest["name"])
+    return removed
+
+
+def check_integrity(db_path):
+    """Run PRAGMA integrity_check; returns (ok, message)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    except sqlite3.DatabaseError as e:
+        return False, str(e)
+    finally:
+        conn.close()
+    return rows == ["ok"], "; ".join(rows)
+
+
+# ======== Internals ========
+
+def _online_copy(src_path, dest_path, pages_per_step, pause, progress=None, standalone=False):
+    src = sqlite3.connect(src_path)
+    dest = sqlite3.connect(dest_path)
+
+    def step(status, remaining, total):
+        if progress:
+            progress(remaining, total)
+        if remaining and pause:
+            time.sleep(pause)
+
+    try:
+        if src.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            # Pin one read snapshot for the whole copy. WAL readers never block writers, and
+            # without it every commit from another connection restarts the step-wise copy.
+            src.execute("BEGIN")
+            src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        src.backup(dest, pages=pages_per_step, progress=step)
+        if standalone:
+            # A backup file should not depend on -wal/-shm side files
+            dest.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dest.close()
+        src.close()
+
+
+def _page_size(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _page_hashes(db_path, page_size):
+    hashes = []
+    with open(db_path, "rb") as f:
+        while True:
+            page = f.read(page_size)
+            if not page:
+                break
+            hashes.append(hashlib.blake2b(page, digest_size=16).hexdigest())
+    return hashes
+
+
+def _open_output(path, compress):
+    return gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")
+
+
+def _write_full(copy_path, out_path, compress):
+    with open(copy_path, "rb") as src, _open_output(out_path, compress) as out:
+        shutil.copyfileobj(src, out, 1024 * 1024)
+
+
+def _read_full(path, out_path, compressed):
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as src, open(out_path, "wb") as out:
+        shutil.copyfileobj(src, out, 1024 * 1024)
+
+
+def _write_pages(copy_path, out_path, page_size, pages, compress):
+    """Store changed pages as (4-byte page index, page bytes) records"""
+    with open(copy_path, "rb") as src, _open_output(out_path, compress) as out:
+        for index in pages:
+            src.seek(index * page_size)
+            out.write(index.to_bytes(_PAGE_NUMBER_BYTES, "big"))
+            out.write(src.read(page_size))
+
+
+def _apply_pages(path, out, page_size, compressed):
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as src:
+        while True:
+            header = src.read(_PAGE_NUMBER_BYTES)
+            if not header:
+                break
+            page = src.read(page_size)
+            if len(header) != _PAGE_NUMBER_BYTES or len(page) != page_size:
+                raise BackupError(f"Truncated incremental snapshot: {path}")
+            out.seek(int.from_bytes(header, "big") * page_size)
+            out.write(page)
@@ -3,14 +3,11 @@
 import sqlite3
 import os
 
-def initialize_database():
-    """Initialize database with proper text constraints for phone numbers"""
-    db_path = "db/database.db"
-    os.makedirs("db", exist_ok=True)
-
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+# ======== Schema migrations ========
+# Each migration runs once, in its own transaction, and PRAGMA user_version records
+# how many have been applied. Append new migrations; never reorder or edit old ones.
 
+def _create_students_table(cursor):
     # Create the students table with explicit TEXT constraint for contact
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS students (
@@ -30,37 +27,263 @@ def initialize_database():
         CREATE INDEX IF NOT EXISTS idx_students_roll ON students(roll_number)
     ''')
 
-    conn.commit()
-    
-    # Check if we need to fix existing data with missing leading zeros
-    cursor.execute("SELECT id, contact FROM students WHERE contact NOT LIKE '0%' AND length(contact) IN (10, 11)")
-    rows_to_fix = cursor.fetchall()
-    
-    if rows_to_fix:
-        print(f"Found {len(rows_to_fix)} phone numbers that may need leading zeros added...")
-        for student_id, contact in rows_to_fix:
-            # Add leading zero if the number looks like a UK number without it
-            if len(contact) in [10, 11] and contact.isdigit():
-                fixed_contact = '0' + contact
-                cursor.execute("UPDATE students SET contact = ? WHERE id = ?", (fixed_contact, student_id))
-                print(f"Fixed contact for student ID {student_id}: {contact} -> {fixed_contact}")
-        
-        conn.commit()
-        print("Phone number fixes applied.")
-    
-    conn.close()
-    print("Database initialized successfully.")
+def _fix_phone_leading_zeros(cursor):
+    """Add the leading zero to all-digit 10/11 digit contacts that lost it, in one statement"""
+    cursor.execute('''
+        UPDATE students SET contact = '0' || contact
+        WHERE contact NOT LIKE '0%'
+          AND length(contact) IN (10, 11)
+          AND contact NOT GLOB '*[^0-9]*'
+    ''')
+    if cursor.rowcount:
+        print(f"Phone number fixes applied to {cursor.rowcount} student(s).")
 
-def backup_database():
-    """Create a backup of the database"""
-    import shutil
-    from datetime import datetime
-    
-    db_path = "db/database.db"
-    if os.path.exists(db_path):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = f"db/database_backup_{timestamp}.db"
-        shutil.copy2(db_path, backup_path)
-        print(f"Database backed up to: {backup_path}")
-        return backup_path
-    return None
\ No newline at end of file
+def _create_lookup_indexes(cursor):
+    # Case-insensitive name index so prefix LIKE searches can use it, and a contact
+    # index for exact / prefix phone lookups
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_students_name_nocase ON students(name COLLATE NOCASE)
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_students_contact ON students(contact)
+    ''')
+
+def create_search_index(cursor):
+    """
+    Create the trigram FTS5 index used by StudentManager.search_students, plus the
+    triggers that keep it in sync. Existing rows are indexed the first time it is created.
+    Returns False if this SQLite build has no FTS5 support.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'")
+    if cursor.fetchone():
+        return True
+
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE students_fts USING fts5(
+                name, contact, roll_number,
+                content='students', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable, falling back to LIKE searches: {e}")
+        return False
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts(rowid, name, contact, roll_number)
+            VALUES (new.id, new.name, new.contact, new.roll_number);
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, name, contact, roll_number)
+            VALUES ('delete', old.id, old.name, old.contact, old.roll_number);
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_update AFTER UPDATE ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, name, contact, roll_number)
+            VALUES ('delete', old.id, old.name, old.contact, old.roll_number);
+            INSERT INTO students_fts(rowid, name, contact, roll_number)
+            VALUES (new.id, new.name, new.contact, new.roll_number);
+        END
+    ''')
+
+    # Index the rows that already exist in older databases
+    cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild')")
+    print("Search index built.")
+    return True
+
+def create_change_log(cursor):
+    """
+    Create the student_changes feed: every insert, update and delete on students appends
+    (seq, student_id, op) from a trigger, so readers can follow changes with
+    StudentManager.changes_since instead of re-reading the whole table.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK(op IN ('insert', 'update', 'delete'))
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS student_changes_insert AFTER INSERT ON students BEGIN
+            INSERT INTO student_changes(student_id, op) VALUES (new.id, 'insert');
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS student_changes_update AFTER UPDATE ON students BEGIN
+            INSERT INTO student_changes(student_id, op) VALUES (new.id, 'update');
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS student_changes_delete AFTER DELETE ON students BEGIN
+            INSERT INTO student_changes(student_id, op) VALUES (old.id, 'delete');
+        END
+    ''')
+
+def create_match_keys(cursor):
+    """
+    Blocking keys used by managers/dedup.py to find students entered twice, and the
+    change-log position they are current up to (-1 = never built).
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_match_keys (
+            key TEXT NOT NULL,
+            student_id INTEGER NOT NULL,
+            PRIMARY KEY (key, student_id)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_match_keys_student ON student_match_keys(student_id)
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dedup_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            change_seq INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO dedup_state (id, change_seq) VALUES (1, -1)")
+
+# Breakdowns kept in student_stats: dimension -> SQL expression over a students row
+# ({row} is "new", "old" or a table alias). Phone types follow the validate_uk_phone prefixes.
+STATS_DIMENSIONS = {
+    "roll_prefix": "substr({row}.roll_number, 1, 2)",
+    "phone_type": """CASE substr({row}.contact, 1, 2)
+        WHEN '07' THEN 'mobile' WHEN '01' THEN 'landline' WHEN '02' THEN 'landline'
+        WHEN '03' THEN 'non-geographic' WHEN '08' THEN 'special' WHEN '09' THEN 'premium'
+        ELSE 'other' END""",
+    "initial": "upper(substr({row}.name, 1, 1))",
+}
+
+def stats_upsert_sql(row, delta, source=""):
+    """
+    INSERT that adds delta to the total and to each dimension's bucket for {row}; with a
+    source ("FROM students s WHERE ...") it adds one per matching row, grouped per bucket.
+    """
+    selects = [f"SELECT 'total', '', {delta} * COUNT(*) {source}" if source else f"SELECT 'total', '', {delta}"]
+    for dimension, expression in STATS_DIMENSIONS.items():
+        bucket = expression.format(row=row)
+        if source:
+            selects.append(f"SELECT '{dimension}', {bucket}, {delta} * COUNT(*) {source} GROUP BY 2")
+        else:
+            selects.append(f"SELECT '{dimension}', {bucket}, {delta}")
+    return f'''
+        INSERT INTO student_stats (dimension, bucket, count)
+        SELECT * FROM ({" UNION ALL ".join(selects)}) WHERE true
+        ON CONFLICT (dimension, bucket) DO UPDATE SET count = count + excluded.count
+    '''
+
+def rebuild_student_stats(cursor):
+    """Recount student_stats from the students table"""
+    cursor.execute("DELETE FROM student_stats")
+    cursor.execute(stats_upsert_sql("s", 1, "FROM students s"))
+
+def create_student_stats(cursor):
+    """
+    Create student_stats: per-dimension bucket counts (plus the total) kept current by
+    triggers, so StudentManager.stats() reads a few rows instead of scanning students.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_stats (
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (dimension, bucket)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_insert AFTER INSERT ON students BEGIN
+            {stats_upsert_sql("new", 1)};
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_delete AFTER DELETE ON students BEGIN
+            {stats_upsert_sql("old", -1)};
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_update AFTER UPDATE OF name, contact, roll_number ON students BEGIN
+            {stats_upsert_sql("old", -1)};
+            {stats_upsert_sql("new", 1)};
+        END
+    ''')
+
+    rebuild_student_stats(cursor)
+
+MIGRATIONS = [
+    _create_students_table,     # 1
+    _fix_phone_leading_zeros,   # 2
+    _create_lookup_indexes,     # 3
+    create_search_index,        # 4
+    create_change_log,          # 5
+    create_match_keys,          # 6
+    create_student_stats,       # 7
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(conn):
+    """Apply any migrations newer than the database's user_version; returns the new version"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        version = number
+    return version
+
+def initialize_database(db_path="db/database.db"):
+    """Initialize database with proper text constraints for phone numbers"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    # Autocommit mode so each migration controls its own transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        # Fast path: nothing to do when the schema is already current
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        version = migrate(conn)
+    finally:
+        conn.close()
+
+    print(f"Database initialized successfully (schema version {version}).")
+
+def backup_database(db_path="db/database.db", **options):
+    """
+    Create an online backup of the database (see utils.backup.create_backup for options).
+    Returns the path of the backup file, or None if there is no database yet.
+    """
+    from utils.backup import BACKUP_DIR, BackupError, create_backup
+
+    if not os.path.exists(db_path):
+        return None
+    backup_dir = options.pop("backup_dir", BACKUP_DIR)
+    try:
+        manifest = create_backup(db_path, backup_dir, **options)
+    except (BackupError, OSError, sqlite3.Error) as e:
+        print(f"Error backing up database: {e}")
+        return None
+    backup_path = os.path.join(backup_dir, manifest["file"])
+    print(f"Database backed up to: {backup_path}")
+    return backup_path
@@ -2,6 +2,15 @@
 
 import re
 
+# Compiled once at import; the validators below run millions of times during imports
+_ROLL_RE = re.compile(r"\d{7}")
+_NON_DIGIT_RE = re.compile(r"\D")
+_NAME_RE = re.compile(r"[a-zA-Z\s\-']+")
+
+# Landlines 01/02 (10-11 digits), non-geographic 03, mobile 07,
+# freephone/special 08 and premium rate 09 (11 digits)
+_UK_PHONE_RE = re.compile(r"0(?:[12]\d{8,9}|[3789]\d{9})")
+
 def validate_roll_number(roll):
     """
     Must be exactly 7 digits.
@@ -9,7 +18,33 @@ def validate_roll_number(roll):
     if not roll:
         return False
     roll = str(roll).strip()
-    return bool(re.fullmatch(r"\d{7}", roll))
+    return _ROLL_RE.fullmatch(roll) is not None
+
+def _phone_digits(phone):
+    """Strip formatting and convert +44 to a leading 0, without padding"""
+    phone = str(phone).strip()
+
+    # Handle +44 format
+    if phone.startswith('+44'):
+        phone = '0' + phone[3:]
+
+    # Most stored numbers are already bare digits, so skip the regex for them
+    if phone.isdecimal():
+        return phone
+    return _NON_DIGIT_RE.sub('', phone)
+
+def normalize_uk_phone(phone):
+    """
+    Normalize a UK phone number to bare digits with a leading 0.
+    Used for storage, display and by the batch helpers below.
+    """
+    phone = _phone_digits(phone)
+
+    # Ensure starts with 0
+    if phone and phone[0] != '0' and len(phone) in (10, 11):
+        phone = '0' + phone
+
+    return phone
 
 def validate_uk_phone(phone):
     """
@@ -20,31 +55,8 @@ def validate_uk_phone(phone):
     """
     if not phone:
         return False
-    
-    # Remove spaces, hyphens, and other non-digit characters except +
-    phone = str(phone).strip()
-    
-    # Handle +44 format
-    if phone.startswith('+44'):
-        phone = phone.replace('+44', '0', 1)
-    
-    # Remove all non-digit characters
-    phone = re.sub(r'[^\d]', '', phone)
-    
-    # Must start with 0 and be 10 or 11 digits
-    if not phone.startswith('0'):
-        return False
-    
-    # Check specific patterns
-    patterns = [
-        r'^0[1-2]\d{8,9}$',  # Landlines: 01xxx or 02xxx (10-11 digits)
-        r'^03\d{9}$',        # Non-geographic: 03xxx (11 digits)
-        r'^07\d{9}$',        # Mobile: 07xxx (11 digits)
-        r'^08\d{9}$',        # Freephone/Special: 08xxx (11 digits)
-        r'^09\d{9}$'         # Premium rate: 09xxx (11 digits)
-    ]
-    
-    return any(re.match(pattern, phone) for pattern in patterns)
+
+    return _UK_PHONE_RE.fullmatch(_phone_digits(phone)) is not None
 
 def format_uk_phone(phone):
     """
@@ -52,21 +64,8 @@ def format_uk_phone(phone):
     """
     if not phone:
         return phone
-    
-    phone = str(phone).strip()
-    
-    # Handle +44 format
-    if phone.startswith('+44'):
-        phone = phone.replace('+44', '0', 1)
-    
-    # Remove all non-digit characters
-    phone = re.sub(r'[^\d]', '', phone)
-    
-    # Ensure starts with 0
-    if phone and not phone.startswith('0') and len(phone) in [10, 11]:
-        phone = '0' + phone
-    
-    return phone
+
+    return normalize_uk_phone(phone)
 
 def validate_student_name(name):
     """
@@ -82,8 +81,36 @@ def validate_student_name(name):
         return False
     
     # Should contain only letters, spaces, hyphens, and apostrophes
-    pattern = r"^[a-zA-Z\s\-']+$"
-    return bool(re.match(pattern, name))
+    return _NAME_RE.fullmatch(name) is not None
+
+def validate_rolls(rolls):
+    """
+    Batch version of validate_roll_number: returns a list of booleans.
+    """
+    fullmatch = _ROLL_RE.fullmatch
+    return [bool(roll) and fullmatch(str(roll).strip()) is not None for roll in rolls]
+
+def validate_phones(phones):
+    """
+    Batch version of validate_uk_phone: returns a list of booleans.
+    """
+    fullmatch = _UK_PHONE_RE.fullmatch
+    digits = _phone_digits
+    return [bool(phone) and fullmatch(digits(phone)) is not None for phone in phones]
+
+def normalize_phones(phones):
+    """
+    Batch version of normalize_uk_phone: returns a list of normalized numbers.
+    """
+    normalized = []
+    append = normalized.append
+    digits = _phone_digits
+    for phone in phones:
+        phone = digits(phone)
+        if phone and phone[0] != '0' and len(phone) in (10, 11):
+            phone = '0' + phone
+        append(phone)
+    return normalized
 
 def sanitize_input(text, max_length=None):
     """
@@ -97,4 +124,4 @@ def sanitize_input(text, max_length=None):
     if max_length:
         text = text[:max_length]
     
-    return text
\ No newline at end of file
+    return text